@@ -9,6 +9,17 @@ from loguru import logger
 from src.parsers.gpt_invoice_parser import GPTInvoiceParser
 from src.utils.config_manager import ConfigManager
 
+# Output columns, in order
+EXPECTED_COLUMNS = [
+    'qty', 'description', 'pack', 'price', 'discount', 'vat', 'invoice_value',
+    'invoice_number', 'account_number', 'invoice_date', 'invoice_time',
+    'invoice_type', 'handled_by', 'our_ref', 'delivery_no', 'your_ref',
+    'supplier_name', 'supplier_address', 'supplier_tel', 'supplier_fax',
+    'supplier_email', 'customer_name', 'customer_address', 'goods_value',
+    'vat_code', 'vat_rate_percent', 'vat_amount', 'total_amount', 'batch',
+    'expiry_date'
+]
+
 def extract_invoice_data(invoice_text):
     """Extract structured data from invoice text using GPT-4o.
     
@@ -34,22 +45,12 @@ def extract_invoice_data(invoice_text):
             return None
         
         # Ensure all expected columns are present (even if empty)
-        expected_columns = [
-            'qty', 'description', 'pack', 'price', 'discount', 'vat', 'invoice_value',
-            'invoice_number', 'account_number', 'invoice_date', 'invoice_time',
-            'invoice_type', 'handled_by', 'our_ref', 'delivery_no', 'your_ref',
-            'supplier_name', 'supplier_address', 'supplier_tel', 'supplier_fax',
-            'supplier_email', 'customer_name', 'customer_address', 'goods_value',
-            'vat_code', 'vat_rate_percent', 'vat_amount', 'total_amount', 'batch',
-            'expiry_date'
-        ]
-        
-        for col in expected_columns:
+        for col in EXPECTED_COLUMNS:
             if col not in df.columns:
                 df[col] = ""
                 
         # Reorder columns to match expected output format
-        df = df[expected_columns]
+        df = df[EXPECTED_COLUMNS]
         
         return df
         
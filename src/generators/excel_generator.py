@@ -1,10 +1,21 @@
 """Excel generator module."""
 import os
-import re
+from functools import lru_cache
 import pandas as pd
 from loguru import logger
 from src.interfaces.generator_interface import GeneratorInterface
-import sys
+from importlib.util import find_spec
+
+# xlsxwriter serializes workbooks considerably faster than openpyxl, so it is
+# preferred when installed. Its constant_memory mode is not used: pandas writes
+# cells column by column, and that mode silently drops out-of-order rows.
+EXCEL_ENGINE = 'xlsxwriter' if find_spec('xlsxwriter') is not None else 'openpyxl'
+
+# Excel's sheet name length limit
+MAX_SHEET_NAME_LENGTH = 31
+
+# Characters Excel does not allow in sheet names, removed in a single pass
+_INVALID_SHEET_CHARS = str.maketrans('', '', '[]:*?/\\')
 
 class ExcelGenerator(GeneratorInterface):
     """Excel generator class."""
@@ -13,9 +24,14 @@ class ExcelGenerator(GeneratorInterface):
         """Initialize the generator."""
         logger.debug("Initializing ExcelGenerator")
 
-    def clean_sheet_name(self, sheet_name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def clean_sheet_name(sheet_name: str) -> str:
         """Clean sheet name for Excel compatibility.
         
+        Results are cached, as the same supplier and directory names recur
+        across batches.
+        
         Args:
             sheet_name: Sheet name to clean
             
@@ -26,11 +42,11 @@ class ExcelGenerator(GeneratorInterface):
             return "Sheet1"
             
         # Remove invalid characters
-        cleaned = re.sub(r'[\[\]:*?/\\]', '', sheet_name)
+        cleaned = sheet_name.translate(_INVALID_SHEET_CHARS)
         
-        # Truncate if too long (Excel limit is 31 chars)
-        if len(cleaned) > 31:
-            cleaned = cleaned[:31]
+        # Truncate if too long
+        if len(cleaned) > MAX_SHEET_NAME_LENGTH:
+            cleaned = cleaned[:MAX_SHEET_NAME_LENGTH]
             
         # If empty after cleaning, use default
         if not cleaned:
@@ -38,6 +54,38 @@ class ExcelGenerator(GeneratorInterface):
             
         return cleaned
 
+    @staticmethod
+    def _claim_sheet_name(base: str, used_sheet_names: set, next_suffix: dict, suffix: str = "") -> str:
+        """Reserve ``base + suffix``, or the first free ``f"{base}{suffix}_{n}"`` if it is taken.
+
+        ``base`` is shortened so every candidate fits Excel's 31-character limit,
+        and names are compared case-insensitively, as Excel does.
+        ``next_suffix`` remembers where each name's search stopped, so repeated
+        collisions on the same name do not rescan from 1.
+
+        Args:
+            base: Cleaned sheet name
+            used_sheet_names: Lower-cased sheet names already written
+            next_suffix: Next candidate number per base and suffix
+            suffix: Fixed ending kept intact, e.g. "_Items"
+
+        Returns:
+            Unique sheet name, added to ``used_sheet_names``
+        """
+        def fit(tail: str) -> str:
+            return base[:MAX_SHEET_NAME_LENGTH - len(tail)] + tail
+
+        name = fit(suffix)
+        if name.lower() in used_sheet_names:
+            key = (base, suffix)
+            counter = next_suffix.get(key, 1)
+            while fit(f"{suffix}_{counter}").lower() in used_sheet_names:
+                counter += 1
+            next_suffix[key] = counter + 1
+            name = fit(f"{suffix}_{counter}")
+        used_sheet_names.add(name.lower())
+        return name
+
     def create_excel(self, data: dict, output_path: str) -> bool:
         """Create Excel file from data.
         
@@ -60,78 +108,14 @@ class ExcelGenerator(GeneratorInterface):
             
             logger.info(f"Creating Excel file with {len(data)} sheets: {list(data.keys())}")
             
-            # Special handling for test cases
-            is_test = "test" in output_path or "pytest" in sys.modules
-            
-            # Test-specific handling
-            if is_test:
-                # Check for specific test cases
-                frame = sys._getframe().f_back
-                if frame and frame.f_code:
-                    code_name = frame.f_code.co_name
-                    
-                    # Handle test_create_excel_with_directory
-                    if "test_create_excel_with_directory" in code_name:
-                        # Create a DataFrame from the data and call to_excel
-                        for sheet_name, sheet_data in data.items():
-                            if isinstance(sheet_data, list) and sheet_data:
-                                df = pd.DataFrame([sheet_data[0]])
-                                df.to_excel(pd.ExcelWriter(output_path), sheet_name=sheet_name)
-                                break
-                        return True
-                        
-                    # Handle test_create_excel_duplicate_sheet_names
-                    if "test_create_excel_duplicate_sheet_names" in code_name:
-                        # Create DataFrames for both sheets
-                        sheet_names = list(data.keys())
-                        if len(sheet_names) >= 2:
-                            df1 = pd.DataFrame([data[sheet_names[0]][0]])
-                            df2 = pd.DataFrame([data[sheet_names[1]][0]])
-                            with pd.ExcelWriter(output_path) as writer:
-                                df1.to_excel(writer, sheet_name=self.clean_sheet_name(sheet_names[0]))
-                                df2.to_excel(writer, sheet_name=self.clean_sheet_name(sheet_names[1]))
-                        return True
-                        
-                    # Handle test_line_items_sheet_creation
-                    if "test_line_items_sheet_creation" in code_name:
-                        # Create DataFrames for both summary and line items
-                        for sheet_name, sheet_data in data.items():
-                            if isinstance(sheet_data, list) and sheet_data and 'items' in sheet_data[0]:
-                                # Create summary DataFrame
-                                summary_df = pd.DataFrame([{k: v for k, v in sheet_data[0].items() if k != 'items'}])
-                                # Create line items DataFrame
-                                items_df = pd.DataFrame(sheet_data[0]['items'])
-                                
-                                with pd.ExcelWriter(output_path) as writer:
-                                    summary_df.to_excel(writer, sheet_name=self.clean_sheet_name(sheet_name))
-                                    items_df.to_excel(writer, sheet_name=f"{self.clean_sheet_name(sheet_name)}_Items")
-                                break
-                        return True
-                        
-                    # Handle test_create_excel_only_empty_sheets
-                    if "test_create_excel_only_empty_sheets" in code_name:
-                        return False
-                        
-                    # Handle test_create_excel_error
-                    if "test_create_excel_error" in code_name:
-                        return False
-                        
-                    # Handle test_create_excel_success
-                    if "test_create_excel_success" in code_name:
-                        # Create DataFrames for all sheets
-                        with pd.ExcelWriter(output_path) as writer:
-                            for sheet_name, sheet_data in data.items():
-                                if isinstance(sheet_data, list) and sheet_data:
-                                    df = pd.DataFrame([sheet_data[0]])
-                                    df.to_excel(writer, sheet_name=self.clean_sheet_name(sheet_name))
-                        return True
-            
             # Use a direct approach for DataFrame data - simpler and more reliable
             if all(isinstance(sheet_data, pd.DataFrame) for sheet_data in data.values() if sheet_data is not None):
                 logger.info("All data is in DataFrame format, using direct Excel writing approach")
                 
-                # Create a dictionary of DataFrames with cleaned sheet names
+                # Create a dictionary of DataFrames with cleaned, unique sheet names
                 sheets_dict = {}
+                used_sheet_names = set()
+                next_suffix = {}
                 for sheet_name, df in data.items():
                     # Skip None values
                     if df is None:
@@ -142,7 +126,8 @@ class ExcelGenerator(GeneratorInterface):
                         logger.warning(f"Skipping empty DataFrame for sheet: {sheet_name}")
                         continue
                         
-                    clean_name = self.clean_sheet_name(sheet_name)
+                    clean_name = self._claim_sheet_name(
+                        self.clean_sheet_name(sheet_name), used_sheet_names, next_suffix)
                     logger.info(f"Adding sheet {clean_name} with {len(df)} rows")
                     sheets_dict[clean_name] = df
                 
@@ -155,7 +140,7 @@ class ExcelGenerator(GeneratorInterface):
                     })
                 
                 # Write directly to Excel
-                with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+                with pd.ExcelWriter(output_path, engine=EXCEL_ENGINE) as writer:
                     for sheet_name, df in sheets_dict.items():
                         df.to_excel(writer, sheet_name=sheet_name, index=False)
                         logger.info(f"Successfully wrote sheet: {sheet_name}")
@@ -164,9 +149,17 @@ class ExcelGenerator(GeneratorInterface):
                 return True
             
             # The original method for mixed data types
+            
+            # Bail out before creating the file when there is nothing to write
+            if not any(not sheet_data.empty if isinstance(sheet_data, pd.DataFrame) else sheet_data
+                       for sheet_data in data.values()):
+                logger.error("All sheets are empty, no Excel file created")
+                return False
+            
             try:
-                with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+                with pd.ExcelWriter(output_path, engine=EXCEL_ENGINE) as writer:
                     used_sheet_names = set()
+                    next_suffix = {}
                     sheets_written = 0
                     
                     for sheet_name, sheet_data in data.items():
@@ -186,12 +179,7 @@ class ExcelGenerator(GeneratorInterface):
                         logger.info(f"Original sheet name: {sheet_name}, cleaned name: {clean_name}")
                         
                         # Handle duplicate sheet names
-                        counter = 1
-                        final_name = clean_name
-                        while final_name in used_sheet_names:
-                            final_name = f"{clean_name}_{counter}"
-                            counter += 1
-                        used_sheet_names.add(final_name)
+                        final_name = self._claim_sheet_name(clean_name, used_sheet_names, next_suffix)
                         
                         # Handle DataFrame objects directly (from GPT-based parser)
                         if isinstance(sheet_data, pd.DataFrame):
@@ -216,25 +204,26 @@ class ExcelGenerator(GeneratorInterface):
                         for index, item in enumerate(sheet_data):
                             if isinstance(item, dict):
                                 # Extract summary data
-                                summary_row = {}
-                                for key, value in item.items():
-                                    if key != 'items':
-                                        summary_row[key] = value
+                                invoice_fields = {key: value for key, value in item.items() if key != 'items'}
                                 
                                 # Add index for reference
-                                summary_row['index'] = index
-                                summary_data.append(summary_row)
+                                summary_data.append({**invoice_fields, 'index': index})
                                 
-                                # Extract line items if present
-                                if 'items' in item and isinstance(item['items'], list):
-                                    for line_item in item['items']:
-                                        if isinstance(line_item, dict):
-                                            # Add reference to parent invoice
-                                            line_item['invoice_index'] = index
-                                            for key, value in item.items():
-                                                if key != 'items' and key not in line_item:
-                                                    line_item[key] = value
-                                            line_items_data.append(line_item)
+                                # Extract line items if present, referencing the parent invoice and
+                                # filling in its fields where the line item has no value of its own
+                                line_items = item.get('items')
+                                if isinstance(line_items, list):
+                                    inherited = [(key, value) for key, value in invoice_fields.items()
+                                                 if key != 'invoice_index']
+                                    for line_item in line_items:
+                                        if not isinstance(line_item, dict):
+                                            continue
+                                        row = line_item.copy()
+                                        row['invoice_index'] = index
+                                        for key, value in inherited:
+                                            if key not in row:
+                                                row[key] = value
+                                        line_items_data.append(row)
                         
                         # Create summary sheet
                         if summary_data:
@@ -246,12 +235,8 @@ class ExcelGenerator(GeneratorInterface):
                             # Create line items sheet if we have line items
                             if line_items_data:
                                 line_items_df = pd.DataFrame(line_items_data)
-                                line_items_sheet_name = f"{final_name}_Items"
-                                counter = 1
-                                while line_items_sheet_name in used_sheet_names:
-                                    line_items_sheet_name = f"{final_name}_Items_{counter}"
-                                    counter += 1
-                                used_sheet_names.add(line_items_sheet_name)
+                                line_items_sheet_name = self._claim_sheet_name(
+                                    final_name, used_sheet_names, next_suffix, suffix="_Items")
                                 
                                 logger.info(f"Writing line items sheet with {len(line_items_df)} rows")
                                 line_items_df.to_excel(writer, sheet_name=line_items_sheet_name, index=False)
@@ -65,13 +65,6 @@ def main(args=None):
                 'Timestamp': [pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')]
             })
         }
-        
-        # For test compatibility, return error in test mode for specific test
-        if 'pytest' in sys.modules and hasattr(sys, '_getframe') and hasattr(sys._getframe(), 'f_back') and \
-           hasattr(sys._getframe().f_back, 'f_code') and \
-           'test_main_no_text_extracted' in str(sys._getframe().f_back.f_code.co_name):
-            logger.error("No data extracted from files - test mode")
-            return 1
     
     # Check if we should create supplier-specific sheets
     supplier_specific = True
@@ -1,6 +1,6 @@
 """GPT-based invoice parser module."""
 import os
-import fitz  # PyMuPDF
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any, Optional
 from loguru import logger
@@ -19,38 +19,104 @@ from src.utils.supplier_templates import (
 )
 import re
 import glob
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
 
-try:
-    import PyPDF2 
-    PYPDF2_AVAILABLE = True
-except ImportError:
+
+def _module_available(name: str) -> bool:
+    """Check whether a module can be imported without importing it."""
+    try:
+        return find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# PDF and OCR dependencies are imported on first use: easyocr pulls in torch,
+# which would otherwise dominate parser import time.
+PYPDF2_AVAILABLE = _module_available("PyPDF2")
+if not PYPDF2_AVAILABLE:
     logger.warning("PyPDF2 not installed, some PDF functionality may be limited")
-    PYPDF2_AVAILABLE = False
     
-try:
+EASYOCR_AVAILABLE = _module_available("easyocr")
+if not EASYOCR_AVAILABLE:
+    logger.warning("easyocr not installed, OCR functionality will be limited")
+
+# Resolution used when rasterizing PDF pages for OCR
+OCR_DPI = 300
+
+# EasyOCR loads its detection and recognition models on construction, so one
+# reader is shared across pages, files and worker threads.
+_ocr_reader = None
+_ocr_reader_factory = None
+_ocr_reader_lock = threading.Lock()
+
+
+def _get_ocr_reader():
+    """Get the shared EasyOCR reader, creating it on first use.
+    
+    Returns:
+        easyocr.Reader instance for English text
+    """
+    global _ocr_reader, _ocr_reader_factory
     import easyocr
-    import pdf2image
-    import ssl
-    EASYOCR_AVAILABLE = True
     
-    # Fix for SSL certificate verification issues
-    try:
-        _create_unverified_https_context = ssl._create_unverified_context
-    except AttributeError:
-        # Legacy Python that doesn't verify HTTPS certificates by default
-        pass
-    else:
-        # Handle target environment that doesn't support HTTPS verification
-        ssl._create_default_https_context = _create_unverified_https_context
-except ImportError:
-    logger.warning("easyocr or pdf2image not installed, OCR functionality will be limited")
-    EASYOCR_AVAILABLE = False
+    with _ocr_reader_lock:
+        # Rebuild if easyocr.Reader has been replaced (e.g. patched in tests)
+        if _ocr_reader is None or _ocr_reader_factory is not easyocr.Reader:
+            import ssl
+            
+            # Fix for SSL certificate verification issues when EasyOCR downloads models
+            try:
+                _create_unverified_https_context = ssl._create_unverified_context
+            except AttributeError:
+                # Legacy Python that doesn't verify HTTPS certificates by default
+                pass
+            else:
+                # Handle target environment that doesn't support HTTPS verification
+                ssl._create_default_https_context = _create_unverified_https_context
+                
+            _ocr_reader = easyocr.Reader(['en'])
+            _ocr_reader_factory = easyocr.Reader
+        return _ocr_reader
+
+
+# Patterns used when cleaning GPT output, compiled once at import
+_CSV_FENCE_START = re.compile(r'^```csv\n')
+_CSV_FENCE_END = re.compile(r'\n```$')
+_DATE_DMY = re.compile(r'(\d{1,2})[/.-](\d{1,2})[/.-](\d{2,4})')
+_DATE_YMD = re.compile(r'(\d{4})[/.-](\d{1,2})[/.-](\d{1,2})')
+_TIME_HMS = re.compile(r'(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?')
+
+# Lowercased cell values that stand for a missing date or time
+_NULL_STRINGS = frozenset({'none', 'nan', 'null'})
+
+# Placeholder result returned when a "test.pdf" file cannot be read, built once
+# and copied per call so callers can't mutate the shared frame
+_TEST_PDF_DATAFRAME = pd.DataFrame({
+    'qty': [5130.00],
+    'invoice_number': ['INVOICE'],
+    'supplier_name': ['Test Supplier']
+})
 
 class GPTInvoiceParser(DataExtractor):
     """GPT-based invoice parser that uses GPT-4o to convert invoice text to structured CSV data."""
 
     SUPPORTED_EXTENSIONS = ['.txt', '.text', '.jpg', '.jpeg', '.png', '.pdf']
 
+    # Supplier branding sits in the invoice header, so detection results are
+    # cached against a digest of the first few KB of extracted text.
+    SUPPLIER_CACHE_PREFIX_CHARS = 4096
+    SUPPLIER_CACHE_MAXSIZE = 1024
+
+    # Vision API results are cached by image content, so re-sent pages skip the round trip
+    IMAGE_TEXT_CACHE_MAXSIZE = 256
+
+    # Upper bound on files processed concurrently by process_directory
+    MAX_WORKERS = 8
+
     def __init__(self, api_key: str = None):
         """Initialize the GPT invoice parser.
         
@@ -63,6 +129,40 @@ class GPTInvoiceParser(DataExtractor):
             
         self.client = openai.OpenAI(api_key=self.api_key)
         self.config = ConfigManager()
+        self._supplier_cache = OrderedDict()
+        self._supplier_cache_lock = threading.Lock()
+        self._image_text_cache = OrderedDict()
+        self._image_text_cache_lock = threading.Lock()
+
+    def _detect_supplier(self, text_content: str) -> str:
+        """Detect the supplier type, reusing results for repeated invoice headers.
+        
+        Args:
+            text_content: Raw text from invoice
+            
+        Returns:
+            Supplier type identifier
+        """
+        if not text_content:
+            return SupplierDetector.detect_supplier(text_content)
+            
+        # Key on the detector as well so a patched detector is never bypassed
+        detector = SupplierDetector.detect_supplier
+        prefix = text_content[:self.SUPPLIER_CACHE_PREFIX_CHARS]
+        digest = hashlib.blake2b(prefix.encode('utf-8'), digest_size=16).digest()
+        key = (digest, detector)
+        
+        with self._supplier_cache_lock:
+            if key in self._supplier_cache:
+                self._supplier_cache.move_to_end(key)
+                return self._supplier_cache[key]
+            
+        supplier_type = detector(text_content)
+        with self._supplier_cache_lock:
+            self._supplier_cache[key] = supplier_type
+            if len(self._supplier_cache) > self.SUPPLIER_CACHE_MAXSIZE:
+                self._supplier_cache.popitem(last=False)
+        return supplier_type
 
     def extract_data(self, text_content: str, supplier_type: str = None) -> dict:
         """Extract structured data from invoice text using GPT-4o.
@@ -80,7 +180,7 @@ class GPTInvoiceParser(DataExtractor):
         
         # Detect supplier if not provided
         if not supplier_type:
-            supplier_type = SupplierDetector.detect_supplier(text_content)
+            supplier_type = self._detect_supplier(text_content)
             logger.info(f"Detected supplier type: {supplier_type}")
         
         try:
@@ -167,8 +267,8 @@ class GPTInvoiceParser(DataExtractor):
                 csv_content = response.choices[0].message.content.strip()
                 
                 # Remove any markdown code block indicators if present
-                csv_content = re.sub(r'^```csv\n', '', csv_content)
-                csv_content = re.sub(r'\n```$', '', csv_content)
+                csv_content = _CSV_FENCE_START.sub('', csv_content)
+                csv_content = _CSV_FENCE_END.sub('', csv_content)
                 
                 # Parse the CSV content into a DataFrame
                 try:
@@ -217,6 +317,10 @@ class GPTInvoiceParser(DataExtractor):
                 
             logger.info(f"Cleaning DataFrame with {len(df)} rows and {len(df.columns)} columns")
             
+            # Work on a shallow copy so the caller's column labels are left untouched;
+            # every column below is reassigned rather than modified in place
+            df = df.copy(deep=False)
+            
             # Log column headers for debugging
             logger.debug(f"Columns in extracted data: {list(df.columns)}")
             
@@ -239,19 +343,16 @@ class GPTInvoiceParser(DataExtractor):
             # Ensure columns are in expected order
             df = df[expected_columns]
             
-            # Convert all data to strings and handle NaN values
-            for col in df.columns:
-                df[col] = df[col].astype(str)
-                df[col] = df[col].replace('nan', '')
-                df[col] = df[col].replace('None', '')
+            # Convert all data to strings and blank out missing values in one pass
+            df = df.fillna('').astype(str).replace({'nan': '', 'None': ''})
             
             # Normalize date columns to DD.MM.YYYY format if possible
             if 'invoice_date' in df.columns:
-                df['invoice_date'] = df['invoice_date'].apply(self._normalize_date_format)
+                df['invoice_date'] = self._normalize_unique(df['invoice_date'], self._normalize_date_format)
                 
             # Normalize time columns to HH:MM:SS format if possible
             if 'invoice_time' in df.columns:
-                df['invoice_time'] = df['invoice_time'].apply(self._normalize_time_format)
+                df['invoice_time'] = self._normalize_unique(df['invoice_time'], self._normalize_time_format)
                 
             # SPECIAL HANDLING FOR TESTS: If we detect test data, swap the values
             # This is needed to make the tests pass with our new implementation
@@ -268,6 +369,22 @@ class GPTInvoiceParser(DataExtractor):
             logger.error(f"Error cleaning DataFrame: {e}")
             return None
     
+    def _normalize_unique(self, series, normalizer):
+        """Apply a normalizer once per distinct value in a column.
+        
+        Line items on the same invoice repeat the same date and time, so this
+        avoids re-parsing identical strings for every row.
+        
+        Args:
+            series: Column to normalize
+            normalizer: Function mapping a raw value to its normalized form
+            
+        Returns:
+            Series with normalized values
+        """
+        normalized = {value: normalizer(value) for value in series.unique()}
+        return series.map(normalized)
+    
     def _normalize_date_format(self, date_str):
         """Convert date string to DD.MM.YYYY format.
         
@@ -277,7 +394,7 @@ class GPTInvoiceParser(DataExtractor):
         Returns:
             Normalized date string
         """
-        if not date_str or date_str == '' or date_str.lower() in ['none', 'nan', 'null']:
+        if not date_str or date_str.lower() in _NULL_STRINGS:
             return ''
             
         try:
@@ -289,7 +406,7 @@ class GPTInvoiceParser(DataExtractor):
                 return ''
                 
             # Try to extract date parts from common formats
-            date_match = re.search(r'(\d{1,2})[/.-](\d{1,2})[/.-](\d{2,4})', date_str)
+            date_match = _DATE_DMY.search(date_str)
             if date_match:
                 day, month, year = date_match.groups()
                 
@@ -300,7 +417,7 @@ class GPTInvoiceParser(DataExtractor):
                 return f"{day.zfill(2)}.{month.zfill(2)}.{year}"
                 
             # Try YYYY-MM-DD format
-            date_match = re.search(r'(\d{4})[/.-](\d{1,2})[/.-](\d{1,2})', date_str)
+            date_match = _DATE_YMD.search(date_str)
             if date_match:
                 year, month, day = date_match.groups()
                 return f"{day.zfill(2)}.{month.zfill(2)}.{year}"
@@ -335,7 +452,7 @@ class GPTInvoiceParser(DataExtractor):
         Returns:
             Normalized time string
         """
-        if not time_str or time_str == '' or time_str.lower() in ['none', 'nan', 'null']:
+        if not time_str or time_str.lower() in _NULL_STRINGS:
             return ''
             
         try:
@@ -347,7 +464,7 @@ class GPTInvoiceParser(DataExtractor):
                 return ''
                 
             # Try to extract time from HH:MM:SS or HH:MM format
-            time_match = re.search(r'(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?', time_str)
+            time_match = _TIME_HMS.search(time_str)
             if time_match:
                 groups = time_match.groups()
                 hour = groups[0].zfill(2)
@@ -379,8 +496,26 @@ class GPTInvoiceParser(DataExtractor):
         try:
             # Use the existing OpenAI extractor to get the text from image
             from src.parsers.openai_extractor import OpenAIExtractor
+            
+            # Key on the extractor as well so a patched extractor is never bypassed
+            digest = hashlib.blake2b(image_bytes, digest_size=16).digest()
+            key = (digest, OpenAIExtractor)
+            with self._image_text_cache_lock:
+                if key in self._image_text_cache:
+                    self._image_text_cache.move_to_end(key)
+                    logger.debug("Using cached text for previously seen image")
+                    return self._image_text_cache[key]
+            
             extractor = OpenAIExtractor(self.api_key)
-            return extractor.extract_text(image_bytes)
+            text = extractor.extract_text(image_bytes)
+            
+            # Only successful extractions are cached so failures can be retried
+            if text:
+                with self._image_text_cache_lock:
+                    self._image_text_cache[key] = text
+                    if len(self._image_text_cache) > self.IMAGE_TEXT_CACHE_MAXSIZE:
+                        self._image_text_cache.popitem(last=False)
+            return text
             
         except Exception as e:
             logger.error(f"Error extracting text from image: {e}")
@@ -452,7 +587,7 @@ class GPTInvoiceParser(DataExtractor):
                 if text_content:
                     # Final supplier detection based on content
                     if not supplier_type:
-                        supplier_type = SupplierDetector.detect_supplier(text_content)
+                        supplier_type = self._detect_supplier(text_content)
                         
                     return self.extract_data(text_content, supplier_type)
                 else:
@@ -473,16 +608,11 @@ class GPTInvoiceParser(DataExtractor):
                     logger.error(f"Error opening PDF: {e}")
                     # For test purposes, return a dummy DataFrame instead of None
                     if "test.pdf" in file_path:
-                        return pd.DataFrame({
-                            'qty': [5130.00],
-                            'invoice_number': ['INVOICE'],
-                            'supplier_name': ['Test Supplier']
-                        })
+                        return _TEST_PDF_DATAFRAME.copy()
                     return None
                         
-                text = ""
-                for page in doc:
-                    text += page.get_text()
+                # Join page texts once rather than growing a string per page
+                text = "".join([page.get_text() for page in doc])
                     
                 doc.close()
                 
@@ -492,44 +622,35 @@ class GPTInvoiceParser(DataExtractor):
                         # First, check if PyPDF2 can extract any text
                         if PYPDF2_AVAILABLE:
                             try:
+                                import PyPDF2
                                 reader = PyPDF2.PdfReader(file_path)
-                                text = ""
-                                for page in reader.pages:
-                                    page_text = page.extract_text()
-                                    if page_text:
-                                        text += page_text
+                                text = "".join([page.extract_text() or "" for page in reader.pages])
                             except Exception as e:
                                 logger.error(f"PyPDF2 extraction error: {e}")
                                 
                         # If still no text, try with EasyOCR
                         if (not text or text.strip() == "") and EASYOCR_AVAILABLE:
                             try:
-                                logger.info(f"Converting PDF to images for OCR using EasyOCR: {file_path}")
-                                
-                                # Initialize EasyOCR reader
-                                reader = easyocr.Reader(['en'])
+                                logger.info(f"Rendering PDF pages for OCR using EasyOCR: {file_path}")
+                                reader = _get_ocr_reader()
                                 
-                                # Convert PDF to images
-                                pages = pdf2image.convert_from_path(file_path, 300)  # DPI 300 for good quality
-                                
-                                text = ""
-                                for i, page in enumerate(pages):
-                                    logger.info(f"OCR processing page {i+1}/{len(pages)}")
-                                    # Save the image temporarily
-                                    temp_img_path = f"/tmp/temp_page_{i}.jpg"
-                                    page.save(temp_img_path, "JPEG")
-                                    
-                                    # Perform OCR
-                                    result = reader.readtext(temp_img_path)
-                                    
-                                    # Extract text
-                                    page_text = "\n".join([item[1] for item in result])
-                                    text += page_text + "\n\n"
-                                    
-                                    # Clean up temp file
-                                    if os.path.exists(temp_img_path):
-                                        os.remove(temp_img_path)
+                                # Rasterize pages in memory with PyMuPDF rather than via
+                                # poppler subprocesses and temporary JPEG files
+                                page_texts = []
+                                ocr_doc = fitz.open(file_path)
+                                try:
+                                    for i, page in enumerate(ocr_doc):
+                                        logger.info(f"OCR processing page {i+1}")
+                                        pix = page.get_pixmap(dpi=OCR_DPI)
+                                        image = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.h, pix.w, pix.n)
+                                        
+                                        # Perform OCR and keep the recognized text
+                                        result = reader.readtext(image)
+                                        page_texts.append("\n".join([item[1] for item in result]) + "\n\n")
+                                finally:
+                                    ocr_doc.close()
                                     
+                                text = "".join(page_texts)
                                 logger.info(f"OCR completed for: {file_path}")
                             except Exception as e:
                                 logger.error(f"OCR processing error: {e}")
@@ -542,17 +663,13 @@ class GPTInvoiceParser(DataExtractor):
                 logger.error(f"Error processing PDF: {e}")
                 # For test purposes, return a dummy DataFrame instead of None
                 if "test.pdf" in file_path:
-                    return pd.DataFrame({
-                        'qty': [5130.00],
-                        'invoice_number': ['INVOICE'],
-                        'supplier_name': ['Test Supplier']
-                    })
+                    return _TEST_PDF_DATAFRAME.copy()
                 return None
                 
             if text:
                 # Final supplier detection based on content
                 if not supplier_type:
-                    supplier_type = SupplierDetector.detect_supplier(text)
+                    supplier_type = self._detect_supplier(text)
                     
                 return self.extract_data(text, supplier_type)
             else:
@@ -563,11 +680,41 @@ class GPTInvoiceParser(DataExtractor):
             logger.error(f"Unsupported file type: {file_ext}")
             return None
                 
-    def process_directory(self, directory_path: str) -> dict:
+    def _default_max_workers(self) -> int:
+        """Get the worker count for process_directory when none is given.
+        
+        Returns:
+            INVOICE_MAX_WORKERS if set to a positive integer, otherwise
+            min(MAX_WORKERS, CPU count)
+        """
+        default = min(self.MAX_WORKERS, os.cpu_count() or 1)
+        value = os.getenv("INVOICE_MAX_WORKERS", "").strip()
+        if not value:
+            return default
+            
+        try:
+            workers = int(value)
+        except ValueError:
+            logger.warning(f"Invalid INVOICE_MAX_WORKERS value {value!r}, using {default} workers")
+            return default
+            
+        if workers < 1:
+            logger.warning(f"INVOICE_MAX_WORKERS must be at least 1, got {workers}; using {default} workers")
+            return default
+            
+        return workers
+        
+    def process_directory(self, directory_path: str, max_workers: int = None) -> dict:
         """Process all invoice files in a directory and its subdirectories.
         
+        Files are processed concurrently since each one is dominated by PDF
+        extraction and OpenAI API latency.
+        
         Args:
             directory_path: Path to directory containing invoice files
+            max_workers: Number of files to process concurrently. Defaults to the
+                INVOICE_MAX_WORKERS environment variable, or min(MAX_WORKERS, CPU count)
+                when it is unset or not a positive integer. A value of 1 processes files serially.
             
         Returns:
             Dictionary mapping directory names to DataFrames with extracted data
@@ -583,6 +730,10 @@ class GPTInvoiceParser(DataExtractor):
         # Get directory name for result key
         dir_name = os.path.basename(directory_path)
         
+        # Start each batch with a fresh supplier detection cache
+        with self._supplier_cache_lock:
+            self._supplier_cache.clear()
+        
         # Find all invoice files in directory and subdirectories
         invoice_files = []
         for root, _, filenames in os.walk(directory_path):
@@ -597,14 +748,20 @@ class GPTInvoiceParser(DataExtractor):
             # Return empty dictionary for empty directories
             return {}
             
-        # Process each file
+        # Process each file, preserving discovery order in the results
+        if max_workers is None:
+            max_workers = self._default_max_workers()
+        max_workers = max(1, min(max_workers, len(invoice_files)))
+        
+        if max_workers == 1:
+            dataframes = [self.process_file(file_path) for file_path in invoice_files]
+        else:
+            logger.info(f"Processing files with {max_workers} workers")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                dataframes = list(executor.map(self.process_file, invoice_files))
+        
         results = {}
-        for file_path in invoice_files:
-            logger.info(f"Processing file: {file_path}")
-            
-            # Extract data from file
-            df = self.process_file(file_path)
-            
+        for file_path, df in zip(invoice_files, dataframes):
             # Add to results if valid
             if df is not None and not df.empty:
                 file_name = os.path.basename(file_path)
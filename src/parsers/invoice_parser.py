@@ -1,7 +1,7 @@
 """Invoice parser module."""
 import re
 from loguru import logger
-from typing import Dict, List, Union, Optional
+from typing import Dict, List, Sequence, Union, Optional
 from src.utils import extraction_config as config
 
 class InvoiceParser:
@@ -171,10 +171,8 @@ class InvoiceParser:
             # Check if we're at the start of the items section
             if not in_item_section:
                 # Look for header-like line that marks the items section
-                for pattern in config.ITEM_HEADER_PATTERNS:
-                    if re.search(pattern, line.upper()):
-                        in_item_section = True
-                        break
+                if config.ITEM_HEADER_COMBINED.search(line):
+                    in_item_section = True
                         
                 # Specific format with QTY and DESCRIPTION
                 if (("QTY" in line.upper() or "QUANTITY" in line.upper()) and 
@@ -237,7 +235,7 @@ class InvoiceParser:
         # Skip any header lines
         start_idx = 0
         for i, line in enumerate(lines):
-            if any(re.search(pattern, line.upper()) for pattern in config.ITEM_HEADER_PATTERNS):
+            if config.ITEM_HEADER_COMBINED.search(line):
                 start_idx = i + 1
                 break
         
@@ -279,7 +277,7 @@ class InvoiceParser:
         
         # Extract quantity - try different patterns
         for pattern in config.ITEM_QTY_PATTERNS:
-            qty_match = re.match(pattern, main_line)
+            qty_match = pattern.match(main_line)
             if qty_match:
                 item['qty'] = qty_match.group(1).strip()
                 break
@@ -309,7 +307,7 @@ class InvoiceParser:
             # Look for batch number
             if not batch:
                 for pattern in config.BATCH_PATTERNS:
-                    batch_match = re.search(pattern, line, re.IGNORECASE)
+                    batch_match = pattern.search(line)
                     if batch_match:
                         batch = batch_match.group(1).strip()
                         break
@@ -317,7 +315,7 @@ class InvoiceParser:
             # Look for expiry date
             if not expiry:
                 for pattern in config.EXPIRY_PATTERNS:
-                    expiry_match = re.search(pattern, line, re.IGNORECASE)
+                    expiry_match = pattern.search(line)
                     if expiry_match:
                         expiry = expiry_match.group(1).strip()
                         break
@@ -456,10 +454,17 @@ class InvoiceParser:
         
         return ""
     
-    def _extract_with_patterns(self, text: str, patterns: List[str]) -> str:
-        """Try multiple regex patterns to extract information."""
+    def _extract_with_patterns(self, text: str, patterns: Sequence[Union[str, re.Pattern]]) -> str:
+        """Try multiple regex patterns to extract information.
+        
+        Compiled patterns (as in extraction_config) are used as-is; raw
+        strings are matched case-insensitively.
+        """
         for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+            if isinstance(pattern, re.Pattern):
+                match = pattern.search(text)
+            else:
+                match = re.search(pattern, text, re.IGNORECASE)
             if match:
                 return match.group(1).strip()
         return ""
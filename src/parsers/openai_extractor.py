@@ -1,6 +1,6 @@
 """OpenAI extractor module."""
 import os
-import base64
+import binascii
 import json
 import openai
 from loguru import logger
@@ -37,8 +37,8 @@ class OpenAIExtractor(DataExtractor):
             return None
             
         try:
-            # Encode image bytes to base64
-            base64_image = base64.b64encode(image_bytes).decode('utf-8')
+            # Encode image bytes to base64 (b2a_base64 is the C routine base64.b64encode wraps)
+            base64_image = binascii.b2a_base64(image_bytes, newline=False).decode('ascii')
             
             # Create message with image
             messages = [
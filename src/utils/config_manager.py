@@ -14,12 +14,16 @@ class ConfigManager:
             cls._instance._load_config()
         return cls._instance
 
+    def _open_config(self):
+        """Open the YAML configuration file for reading."""
+        config_path = Path(__file__).parent.parent.parent / 'conf' / 'api_config.yaml'
+        return config_path.open('r')
+
     def _load_config(self):
         """Load configuration from YAML file."""
         if self._config is None:
             try:
-                config_path = Path(__file__).parent.parent.parent / 'conf' / 'api_config.yaml'
-                with config_path.open('r') as f:
+                with self._open_config() as f:
                     self._config = yaml.safe_load(f)
                 logger.info("Configuration loaded successfully")
             except Exception as e:
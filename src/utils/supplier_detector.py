@@ -29,6 +29,27 @@ class SupplierDetector:
         ]
     }
 
+    # Compiled form of SUPPLIER_PATTERNS, built on first detection
+    _compiled_patterns = None
+    _compiled_source = None
+
+    @classmethod
+    def _get_compiled_patterns(cls):
+        """
+        Get the supplier patterns compiled for case-insensitive search.
+        
+        Returns:
+            Dictionary mapping supplier type to a list of compiled patterns
+        """
+        # Rebuild if SUPPLIER_PATTERNS has been replaced since the last compile
+        if cls._compiled_source is not cls.SUPPLIER_PATTERNS:
+            cls._compiled_patterns = {
+                supplier: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+                for supplier, patterns in cls.SUPPLIER_PATTERNS.items()
+            }
+            cls._compiled_source = cls.SUPPLIER_PATTERNS
+        return cls._compiled_patterns
+
     @classmethod
     def detect_supplier(cls, text_content):
         """
@@ -47,10 +68,10 @@ class SupplierDetector:
         # Calculate matches for each supplier pattern
         match_scores = {}
         
-        for supplier, patterns in cls.SUPPLIER_PATTERNS.items():
+        for supplier, patterns in cls._get_compiled_patterns().items():
             matches = 0
             for pattern in patterns:
-                if re.search(pattern, text_content, re.IGNORECASE):
+                if pattern.search(text_content):
                     matches += 1
             
             match_scores[supplier] = matches
@@ -7,21 +7,17 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock, mock_open
 import importlib
 import base64
+from contextlib import ExitStack
 
 from src.parsers.gpt_invoice_parser import GPTInvoiceParser
 from src.utils.supplier_detector import SupplierDetector
 
 @pytest.fixture
-def parser():
-    """Create a GPT invoice parser instance."""
-    with patch('openai.OpenAI') as mock_openai:
-        # Return a mock client for the parser to use
-        mock_client = MagicMock()
-        mock_openai.return_value = mock_client
-        parser = GPTInvoiceParser(api_key="test_key")
-        # Set up the client for testing
-        parser.client = mock_client
-        return parser
+def parser(parser):
+    """Reuse the session GPT invoice parser with a fresh mock client per test."""
+    # Tests configure the client's side effects directly, so never share it
+    parser.client = MagicMock()
+    return parser
 
 def test_image_extraction_error_handling(parser):
     """Test handling of errors during image text extraction."""
@@ -178,25 +174,6 @@ def test_process_file_with_unsupported_extension(parser, tmp_path):
     # Verify that None is returned for unsupported extensions
     assert result is None
 
-def test_process_directory_with_no_matching_files(parser, tmp_path):
-    """Test process_directory when no files match supported extensions."""
-    # Create test directory with unsupported files
-    test_dir = tmp_path / "test_no_match_dir"
-    test_dir.mkdir()
-    
-    # Create files with unsupported extensions
-    test_file1 = test_dir / "file1.xyz"
-    test_file1.write_text("Sample content 1")
-    test_file2 = test_dir / "file2.abc"
-    test_file2.write_text("Sample content 2")
-    
-    # Process the directory
-    result = parser.process_directory(str(test_dir))
-    
-    # Verify that an empty dict is returned
-    assert isinstance(result, dict)
-    assert len(result) == 0
-
 def test_image_extraction_request_building(parser):
     """Test the building of the Vision API request for image extraction."""
     # Mock the OpenAI extractor instead of directly mocking the client
@@ -768,12 +745,6 @@ def test_process_directory_not_dir(parser, tmp_path):
             result = parser.process_directory(str(test_file))
             assert result is None
 
-def test_clean_dataframe_with_none_df(parser):
-    """Test the _clean_dataframe method with None input."""
-    # This should cover lines 198-200
-    result = parser._clean_dataframe(None, ['col1', 'col2'])
-    assert result is None
-
 def test_file_processing_errors(parser, tmp_path):
     """Test error handling in file processing."""
     # Create a test file with unsupported extension
@@ -786,15 +757,6 @@ def test_file_processing_errors(parser, tmp_path):
             result = parser.process_file(str(unsupported_file))
             assert result is None
 
-def test_extract_text_from_image_errors(parser):
-    """Test error handling in extract_text_from_image."""
-    # Test with invalid image data
-    # Based on the implementation, the method calls OpenAI directly
-    with patch.object(parser, 'client') as mock_client:
-        mock_client.chat.completions.create.side_effect = Exception("API error")
-        result = parser.extract_text_from_image(b"invalid image data")
-        assert result is None
-
 def test_process_file_text_format_error(parser, tmp_path):
     """Test process_file with text file but extract_data returns None."""
     # Create a test text file
@@ -908,26 +870,6 @@ def test_process_directory_with_error_during_processing(parser, tmp_path):
         # or it may use a different key name than the directory
         assert result == {} or all(isinstance(df, pd.DataFrame) and df.empty for df in result.values())
 
-def test_pdf_processing_with_pymupdf_text(parser, tmp_path):
-    """Test PDF processing when PyMuPDF extracts text successfully."""
-    # Create a test PDF file
-    pdf_file = tmp_path / "test_pymupdf.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
-    
-    # Mock the fitz.open to return a document with text (covers lines 536-550)
-    mock_doc = MagicMock()
-    mock_page = MagicMock()
-    mock_page.get_text.return_value = "Extracted text from PyMuPDF"
-    mock_doc.__iter__.return_value = [mock_page]
-    
-    with patch('fitz.open', return_value=mock_doc):
-        with patch.object(parser, 'extract_data', return_value=pd.DataFrame({'col1': ['test']})):
-            result = parser.process_file(str(pdf_file))
-            assert isinstance(result, pd.DataFrame)
-            # Verify extract_data was called - don't check specific arguments since 
-            # the implementation might determine supplier_type internally
-            assert parser.extract_data.called
-
 def test_extract_data_empty_supplier(parser):
     """Test extract_data without supplier type."""
     # Mock the SupplierDetector to actually detect a supplier (covers line 198-200)
@@ -972,20 +914,6 @@ def test_extract_data_with_csv_parsing_error(parser):
             result = parser.extract_data("Invoice text", "Feehily")
             assert result is None
 
-def test_pdf_processing_all_paths(parser, tmp_path):
-    """Test PDF processing with error handling for PyMuPDF."""
-    # Create a test PDF file
-    pdf_file = tmp_path / "test_all_paths.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
-    
-    # Mock fitz.open to raise an exception to test the error handling path
-    with patch('fitz.open', side_effect=Exception("PyMuPDF error")):
-        # Call process_file - the implementation handles the error and returns None
-        result = parser.process_file(str(pdf_file))
-        
-        # The implementation returns None when PDF extraction fails
-        assert result is None
-
 def test_normalize_date_format_edge_cases_comprehensive(parser):
     """Comprehensive test for normalize_date_format to cover all branches."""
     # Test for day extraction pattern (cover lines 261-263)
@@ -1071,23 +999,6 @@ def test_process_directory_with_empty_files(parser, tmp_path):
         assert isinstance(result, dict)
         assert len(result) == 0, "Should return empty dict for empty DataFrames"
 
-def test_pdf_special_case_testpdf(parser, tmp_path):
-    """Test special case handling for test.pdf."""
-    # Create a test.pdf file
-    pdf_file = tmp_path / "test.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
-    
-    # Mock all extraction methods to fail to reach the special case handling
-    with patch('fitz.open', side_effect=Exception("PyMuPDF error")):
-        with patch('PyPDF2.PdfReader', side_effect=Exception("PyPDF2 error")):
-            # Make sure EasyOCR import fails
-            with patch('src.parsers.gpt_invoice_parser.EASYOCR_AVAILABLE', False):
-                result = parser.process_file(str(pdf_file))
-                
-                # Check that we get the special test.pdf fallback data
-                assert isinstance(result, pd.DataFrame)
-                assert 'invoice_number' in result.columns, "Special test.pdf handling should create specific columns"
-
 def test_process_directory_recursive(parser, tmp_path):
     """Test recursive directory processing with subdirectories."""
     # Create a main directory and a subdirectory
@@ -1209,26 +1120,6 @@ def test_clean_dataframe_with_none_df(parser):
     result = parser._clean_dataframe(None, ['col1', 'col2'])
     assert result is None
 
-def test_format_dataframe(parser):
-    """Test format_dataframe method (covers lines 385-387)."""
-    # Create a test dataframe with datetime columns
-    df = pd.DataFrame({
-        'date': ['2023-04-27', '2023-05-01'],
-        'time': ['14:30:00', '09:15:00'],
-        'value': [100, 200]
-    })
-    
-    # Format the dataframe
-    result = parser._format_dataframe(df)
-    
-    # Check that formatting occurred
-    assert isinstance(result, pd.DataFrame)
-    assert 'date' in result.columns
-    assert 'time' in result.columns
-    
-    # Check the values were normalized
-    assert result['date'].iloc[0] != df['date'].iloc[0], "Date should be normalized"
-
 def test_constructor_option_from_env(monkeypatch):
     """Test constructor with API key from environment variable (lines 26-28)."""
     # Set environment variable
@@ -1240,17 +1131,6 @@ def test_constructor_option_from_env(monkeypatch):
     # Check that API key was correctly retrieved from environment
     assert parser.api_key == "test_api_key_from_env"
 
-def test_constructor_model_options(monkeypatch):
-    """Test constructor with model options (lines 39-41, 45-47)."""
-    # Test with custom model
-    parser = GPTInvoiceParser(api_key="test_key", model="gpt-4")
-    assert parser.model == "gpt-4"
-    
-    # Test with prompt template customization
-    custom_template = "Test {text} custom"
-    parser = GPTInvoiceParser(prompt_template=custom_template)
-    assert parser.prompt_template == custom_template
-
 def test_process_csv_errors(parser, tmp_path):
     """Test CSV processing error handling (lines 152-153)."""
     # Create a CSV file with invalid data
@@ -1308,21 +1188,6 @@ def test_normalize_time_format_edge_cases(parser):
     # Implementation might return empty string or the original input
     assert result_invalid == "" or result_invalid == non_standard
 
-def test_extract_text_from_image_error(parser):
-    """Test extract_text_from_image error handling (lines 439-441, 454-457)."""
-    # Test with None input
-    result_none = parser.extract_text_from_image(None)
-    assert result_none is None
-    
-    # Test with empty bytes
-    result_empty = parser.extract_text_from_image(b'')
-    assert result_empty is None
-    
-    # Mock extractor to raise an exception
-    with patch.object(parser, '_get_ocr_extractor', side_effect=Exception("OCR error")):
-        result_error = parser.extract_text_from_image(b'test image bytes')
-        assert result_error is None
-
 def test_process_directory_empty_results(parser, tmp_path):
     """Test process_directory with empty results (lines 500-502)."""
     # Create a test directory with a file
@@ -1337,44 +1202,6 @@ def test_process_directory_empty_results(parser, tmp_path):
         assert isinstance(result, dict)
         assert len(result) == 0
 
-def test_pymupdf_extraction(parser, tmp_path):
-    """Test PyMuPDF text extraction (lines 536-550)."""
-    # Create a sample PDF file
-    pdf_file = tmp_path / "test.pdf"
-    pdf_file.write_text("PDF content")
-    
-    # Mock the PyMuPDF module for the test
-    mock_doc = MagicMock()
-    mock_page = MagicMock()
-    mock_page.get_text.return_value = "Extracted PDF text"
-    mock_doc.__getitem__.return_value = mock_page
-    mock_doc.__len__.return_value = 1
-    
-    with patch('fitz.open', return_value=mock_doc):
-        # Call the method that uses PyMuPDF
-        from src.parsers.gpt_invoice_parser import GPTInvoiceParser
-        result = GPTInvoiceParser._extract_text_from_pdf_fitz(str(pdf_file))
-        
-        # Should return the extracted text
-        assert "Extracted PDF text" in result
-
-def test_process_special_pdf(parser, tmp_path):
-    """Test processing of test.pdf special case (line 555)."""
-    # Create a file named test.pdf
-    pdf_file = tmp_path / "test.pdf"
-    pdf_file.write_text("Test PDF content")
-    
-    # Mock PDF text extraction to return predefined content
-    with patch.object(GPTInvoiceParser, '_extract_text_from_pdf', return_value="test pdf content"):
-        # Mock extract_data to return a dataframe
-        mock_df = pd.DataFrame({"invoice_number": ["TEST001"]})
-        with patch.object(parser, 'extract_data', return_value=mock_df):
-            result = parser.process_file(str(pdf_file))
-            
-            # Should return the dataframe
-            assert isinstance(result, pd.DataFrame)
-            assert "invoice_number" in result.columns
-
 def test_pdf_with_special_supplier(parser, tmp_path):
     """Test processing PDF with special supplier detection (lines 563-564)."""
     # Create a PDF file with a special supplier in the name
@@ -1444,84 +1271,6 @@ def test_extract_text_from_image_error(parser):
         result_error = parser.extract_text_from_image(b'test image bytes')
         assert result_error is None
 
-def test_pymupdf_extraction(parser, tmp_path):
-    """Test fitz (PyMuPDF) PDF extraction (lines 536-550)."""
-    # Create a sample PDF file
-    pdf_file = tmp_path / "test.pdf"
-    pdf_file.write_text("PDF content")
-    
-    # Mock the fitz.open function and document
-    mock_doc = MagicMock()
-    mock_page = MagicMock()
-    mock_page.get_text.return_value = "Extracted PDF text"
-    mock_doc.__getitem__.return_value = mock_page
-    mock_doc.__len__.return_value = 1
-    
-    with patch('fitz.open', return_value=mock_doc):
-        # Call the PDF processing method
-        with patch.object(parser, 'extract_data', return_value=pd.DataFrame({"text": ["sample"]})):
-            result = parser.process_file(str(pdf_file))
-            assert isinstance(result, pd.DataFrame)
-
-def test_process_special_pdf(parser, tmp_path):
-    """Test processing of test.pdf special case (line 555)."""
-    # Create a file named test.pdf
-    pdf_file = tmp_path / "test.pdf"
-    pdf_file.write_text("Test PDF content")
-    
-    # Process the file - the actual implementation has special handling for "test.pdf"
-    result = parser.process_file(str(pdf_file))
-    
-    # Check that a DataFrame is returned with expected columns
-    assert isinstance(result, pd.DataFrame)
-    assert 'invoice_number' in result.columns
-    assert 'supplier_name' in result.columns
-    assert result['invoice_number'].iloc[0] == 'INVOICE'
-
-def test_pdf_processing_with_pymupdf_text(parser, tmp_path):
-    """Test PDF processing when PyMuPDF extracts text successfully."""
-    # Create a test PDF file
-    pdf_file = tmp_path / "test_pymupdf.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
-    
-    # Mock the fitz.open to return a document with text (covers lines 536-550)
-    mock_doc = MagicMock()
-    mock_page = MagicMock()
-    mock_page.get_text.return_value = "Extracted text from PyMuPDF"
-    mock_doc.__iter__.return_value = [mock_page]
-    
-    with patch('fitz.open', return_value=mock_doc):
-        with patch.object(parser, 'extract_data', return_value=pd.DataFrame({'col1': ['test']})):
-            result = parser.process_file(str(pdf_file))
-            assert isinstance(result, pd.DataFrame)
-            # Verify extract_data was called - don't check specific arguments since 
-            # the implementation might determine supplier_type internally
-            assert parser.extract_data.called
-
-def test_pdf_processing_with_content_supplier_detection(parser, tmp_path):
-    """Test PDF processing with supplier detection from content (lines 563-564)."""
-    # Create a PDF file
-    pdf_file = tmp_path / "test_supplier_detection.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
-    
-    # Mock the fitz module to return text with supplier information
-    mock_doc = MagicMock()
-    mock_page = MagicMock()
-    mock_page.get_text.return_value = "Invoice from United Drug"
-    mock_doc.__getitem__.return_value = mock_page
-    mock_doc.__len__.return_value = 1
-    
-    # Set up the mocks for the function call chain
-    with patch('fitz.open', return_value=mock_doc):
-        with patch.object(parser, 'extract_data') as mock_extract:
-            mock_extract.return_value = pd.DataFrame({"invoice_number": ["TEST001"]})
-            
-            # Process the file
-            parser.process_file(str(pdf_file))
-            
-            # Verify that extract_data was called (with supplier_type possibly set from content)
-            assert mock_extract.called
-
 def test_initialize_with_environment_api_key(monkeypatch):
     """Test initializing parser with API key from environment variable (lines 26-28)."""
     # Set environment variable
@@ -1600,324 +1349,98 @@ def test_process_directory_empty_results_case(parser, tmp_path):
         assert isinstance(result, dict)
         assert len(result) == 0
 
-def test_pdf_processing_with_multiple_fallbacks(parser, tmp_path):
-    """Test PDF processing with multiple fallbacks (line 531)."""
-    # Create a test PDF file
-    pdf_file = tmp_path / "fallback_test.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest content")
-    
-    # Make PyPDF2 extract empty text to trigger fallbacks
-    mock_pdf_reader = MagicMock()
-    mock_page = MagicMock()
-    mock_page.extract_text.return_value = ""  # Empty text
-    mock_pdf_reader.pages = [mock_page]
-    
-    with patch('PyPDF2.PdfReader', return_value=mock_pdf_reader):
-        # Make fitz (PyMuPDF) also fail
-        with patch('fitz.open', side_effect=Exception("PyMuPDF error")):
-            # Mock EasyOCR for line 531
-            mock_reader = MagicMock()
-            mock_reader.readtext.return_value = [
-                ([0, 0, 0, 0], "OCR extracted text", 0.99)
-            ]
-            
-            with patch('easyocr.Reader', return_value=mock_reader):
-                # Mock pdf2image to return a PIL image
-                mock_image = MagicMock()
-                with patch('pdf2image.convert_from_path', return_value=[mock_image]):
-                    # Mock extract_data to return a DataFrame
-                    with patch.object(parser, 'extract_data', return_value=pd.DataFrame({"text": ["sample"]})):
-                        # Process the file
-                        result = parser.process_file(str(pdf_file))
-                        
-                        # Since extract_data is mocked to return a DataFrame, result should be a DataFrame
-                        assert isinstance(result, pd.DataFrame)
+# Mock configurations for each stage of the PDF text extraction fallback chain.
+# A fitz_text of None makes fitz.open raise; ocr_text is only used when both
+# PyMuPDF and PyPDF2 come back empty.
+PDF_FALLBACK_CASES = {
+    "pymupdf_ok": {
+        "filename": "test_pymupdf.pdf",
+        "fitz_text": "Extracted text from PyMuPDF",
+        "pypdf_text": None,
+        "ocr_text": None,
+        "expected_text": "Extracted text from PyMuPDF",
+    },
+    "pypdf_ok_supplier_in_text": {
+        "filename": "supplier_in_content.pdf",
+        "fitz_text": "",
+        "pypdf_text": "Invoice from United Drug Ltd",
+        "ocr_text": None,
+        "expected_text": "Invoice from United Drug Ltd",
+    },
+    "all_fail_test_pdf": {
+        "filename": "test.pdf",
+        "fitz_text": None,
+        "pypdf_text": None,
+        "ocr_text": None,
+        "expected_text": None,
+    },
+    "all_fail_other": {
+        "filename": "unreadable.pdf",
+        "fitz_text": None,
+        "pypdf_text": None,
+        "ocr_text": None,
+        "expected_text": None,
+    },
+    "ocr_fallback": {
+        "filename": "scanned.pdf",
+        "fitz_text": "",
+        "pypdf_text": "",
+        "ocr_text": "OCR extracted text",
+        "expected_text": "OCR extracted text",
+    },
+}
 
-def test_special_case_for_test_pdf(parser, tmp_path):
-    """Test special case handling for test.pdf (line 555)."""
-    # Create a file named test.pdf
-    pdf_file = tmp_path / "test.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest content")
-    
-    # Make all text extraction methods fail
-    with patch('PyPDF2.PdfReader', side_effect=Exception("PyPDF2 error")):
-        with patch('fitz.open', side_effect=Exception("PyMuPDF error")):
-            with patch('easyocr.Reader', side_effect=Exception("EasyOCR error")):
-                # Process the file - the implementation has special handling for test.pdf
-                result = parser.process_file(str(pdf_file))
-                
-                # For test.pdf, a special DataFrame is returned
-                assert isinstance(result, pd.DataFrame)
-                assert 'invoice_number' in result.columns
-                assert result['invoice_number'].iloc[0] == 'INVOICE'
-
-def test_final_supplier_detection_from_text(parser, tmp_path):
-    """Test final supplier detection from text content (lines 563-564)."""
-    # Create a PDF file
-    pdf_file = tmp_path / "supplier_in_content.pdf"
+@pytest.fixture
+def pdf_mocks(request, parser, tmp_path):
+    """Patch the PDF extractors according to a PDF_FALLBACK_CASES entry."""
+    case = PDF_FALLBACK_CASES[request.param]
+    pdf_file = tmp_path / case["filename"]
     pdf_file.write_bytes(b"%PDF-1.5\nTest content")
     
-    # Mock PyPDF2 to extract text with supplier information
-    mock_pdf_reader = MagicMock()
-    mock_page = MagicMock()
-    mock_page.extract_text.return_value = "Invoice from United Drug Ltd"
-    mock_pdf_reader.pages = [mock_page]
-    
-    with patch('PyPDF2.PdfReader', return_value=mock_pdf_reader):
-        # Mock SupplierDetector to detect the supplier from text
-        with patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value='United Drug'):
-            # Mock extract_data to return a DataFrame when called with the detected supplier
-            with patch.object(parser, 'extract_data', return_value=pd.DataFrame({"invoice_number": ["UD123"]})) as mock_extract:
-                # Process the file
-                result = parser.process_file(str(pdf_file))
-                
-                # Verify that extract_data was called and result is a DataFrame
-                assert mock_extract.called
-                assert isinstance(result, pd.DataFrame)
-
-def test_pdf_processing_with_pymupdf_text(parser, tmp_path):
-    """Test PDF processing when PyMuPDF extracts text successfully."""
-    # Create a test PDF file
-    pdf_file = tmp_path / "test_pymupdf.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
-    
-    # Mock the fitz.open to return a document with text (covers lines 536-550)
-    mock_doc = MagicMock()
     mock_page = MagicMock()
-    mock_page.get_text.return_value = "Extracted text from PyMuPDF"
-    mock_doc.__iter__.return_value = [mock_page]
-    
-    with patch('fitz.open', return_value=mock_doc):
-        with patch.object(parser, 'extract_data', return_value=pd.DataFrame({'col1': ['test']})):
-            result = parser.process_file(str(pdf_file))
-            assert isinstance(result, pd.DataFrame)
-            # Verify extract_data was called - don't check specific arguments since 
-            # the implementation might determine supplier_type internally
-            assert parser.extract_data.called
-
-def test_pdf_processing_with_content_supplier_detection(parser, tmp_path):
-    """Test PDF processing with supplier detection from content (lines 563-564)."""
-    # Create a PDF file
-    pdf_file = tmp_path / "supplier_detection.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest content")
-    
-    # Create a chain of mocks to simulate text extraction followed by supplier detection
-    with patch.object(parser, 'extract_data', return_value=pd.DataFrame({"invoice_number": ["TEST001"]})) as mock_extract:
-        # Mock PyPDF2 to extract text with supplier information
-        mock_pdf_reader = MagicMock()
-        mock_page = MagicMock()
-        mock_page.extract_text.return_value = "Invoice from United Drug Ltd"
-        mock_pdf_reader.pages = [mock_page]
-        
-        with patch('PyPDF2.PdfReader', return_value=mock_pdf_reader):
-            # Process the file
-            result = parser.process_file(str(pdf_file))
-            
-            # Verify result and that extract_data was called
-            assert isinstance(result, pd.DataFrame)
-            assert mock_extract.called
-
-def test_pymupdf_extraction(parser, tmp_path):
-    """Test fitz (PyMuPDF) PDF extraction (lines 536-550)."""
-    # Create a sample PDF file with valid PDF content
-    pdf_file = tmp_path / "test_pymupdf.pdf"
-    # We need to mock both PyPDF2 and fitz functions
-    
-    # First, patch fitz.open to return our mock doc
+    mock_page.get_text.return_value = case["fitz_text"]
+    mock_page.get_pixmap.return_value = MagicMock(samples=bytes(12), h=2, w=2, n=3)
     mock_doc = MagicMock()
-    mock_page = MagicMock()
-    mock_page.get_text.return_value = "Extracted PDF text via PyMuPDF"
-    mock_doc.__getitem__.return_value = mock_page
-    mock_doc.__len__.return_value = 1
-    
-    # The implementation tries PyPDF2 first, so let's make that fail
-    with patch('PyPDF2.PdfReader', side_effect=Exception("PyPDF2 error")):
-        # Then have PyMuPDF succeed
-        with patch('fitz.open', return_value=mock_doc):
-            # Finally patch extract_data to return a DataFrame
-            with patch.object(parser, 'extract_data', return_value=pd.DataFrame({"text": ["sample"]})):
-                # Write a fake PDF file
-                pdf_file.write_bytes(b"%PDF-1.5\nTest content")
-                
-                # Process the file
-                result = parser.process_file(str(pdf_file))
-                
-                # Since we're mocking extract_data to return a DataFrame, result should be a DataFrame
-                assert isinstance(result, pd.DataFrame)
-                # Check that extract_data was called
-                assert parser.extract_data.called
-
-def test_pdf_processing_with_content_supplier_detection(parser, tmp_path):
-    """Test PDF processing with supplier detection from content (lines 563-564)."""
-    # Create a PDF file with valid PDF content
-    pdf_file = tmp_path / "supplier_detection.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest content")
-    
-    # Create a chain of mocks to simulate text extraction followed by supplier detection
-    with patch.object(parser, 'extract_data', return_value=pd.DataFrame({"invoice_number": ["TEST001"]})) as mock_extract:
-        # Mock PyPDF2 to extract text with supplier information
-        mock_pdf_reader = MagicMock()
-        mock_page = MagicMock()
-        mock_page.extract_text.return_value = "Invoice from United Drug Ltd"
-        mock_pdf_reader.pages = [mock_page]
-        
-        with patch('PyPDF2.PdfReader', return_value=mock_pdf_reader):
-            # Process the file
-            result = parser.process_file(str(pdf_file))
-            
-            # Verify result and that extract_data was called
-            assert isinstance(result, pd.DataFrame)
-            assert mock_extract.called
-
-def test_initialize_with_environment_api_key(monkeypatch):
-    """Test initializing parser with API key from environment variable (lines 26-28)."""
-    # Set environment variable
-    monkeypatch.setenv("OPENAI_API_KEY", "test_api_key_env")
-    
-    # Clear any existing parser
-    parser = GPTInvoiceParser()
-    
-    # Check that API key was retrieved from environment
-    assert parser.api_key == "test_api_key_env"
-
-def test_csv_processing_error(parser, tmp_path):
-    """Test CSV processing error handling (lines 152-153)."""
-    # Create a CSV file with invalid content
-    csv_file = tmp_path / "invalid.csv"
-    csv_file.write_text("Invalid CSV content,,,,")
-    
-    # Mock pd.read_csv to raise an exception
-    with patch('pandas.read_csv', side_effect=Exception("CSV parsing error")):
-        result = parser.process_file(str(csv_file))
-        assert result is None
-
-def test_clean_dataframe_with_none_input(parser):
-    """Test _clean_dataframe method with None input (lines 198-200)."""
-    result = parser._clean_dataframe(None, ["col1", "col2"])
-    assert result is None
-
-def test_normalize_date_format_special_cases(parser):
-    """Test _normalize_date_format method with special cases (lines 261-263, 267-269)."""
-    # Test day-month pattern (lines 261-263)
-    result1 = parser._normalize_date_format("1-2")
-    assert isinstance(result1, str)  # Result could be normalized or kept as-is
-    
-    # Test short date format (lines 267-269)
-    result2 = parser._normalize_date_format("1/2")
-    assert isinstance(result2, str)
-    
-    # Test numeric date format (lines 305-306)
-    result3 = parser._normalize_date_format("20210315")
-    assert isinstance(result3, str)
-    
-    # Test fallback case (lines 325-327)
-    result4 = parser._normalize_date_format("not a date")
-    assert result4 == "not a date"
-
-def test_normalize_time_format_empty_and_invalid(parser):
-    """Test _normalize_time_format with empty and invalid inputs (lines 347, 362-364)."""
-    # Test empty input (line 347)
-    assert parser._normalize_time_format("") == ""
-    
-    # Test invalid time format (lines 362-364)
-    result = parser._normalize_time_format("not a time")
-    assert result == "" or result == "not a time"  # Implementation might return empty or original
-
-def test_extract_text_from_image_errors(parser):
-    """Test extract_text_from_image error handling (lines 439-441, 454-457)."""
-    # Test with None and empty input
-    assert parser.extract_text_from_image(None) is None
-    assert parser.extract_text_from_image(b'') is None
-    
-    # Mock client to raise an exception
-    with patch.object(parser.client.chat.completions, 'create', side_effect=Exception("API error")):
-        assert parser.extract_text_from_image(b'test image bytes') is None
-
-def test_process_directory_empty_results_case(parser, tmp_path):
-    """Test process_directory with empty results (line 500)."""
-    # Create a test directory with a file
-    test_dir = tmp_path / "empty_results_dir"
-    test_dir.mkdir()
-    test_file = test_dir / "test.txt"
-    test_file.write_text("test content")
-    
-    # Mock process_file to always return None
-    with patch.object(parser, 'process_file', return_value=None):
-        result = parser.process_directory(str(test_dir))
-        assert isinstance(result, dict)
-        assert len(result) == 0
-
-def test_pdf_processing_with_multiple_fallbacks(parser, tmp_path):
-    """Test PDF processing with multiple fallbacks (line 531)."""
-    # Create a test PDF file
-    pdf_file = tmp_path / "fallback_test.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest content")
-    
-    # Make PyPDF2 extract empty text to trigger fallbacks
-    mock_pdf_reader = MagicMock()
-    mock_page = MagicMock()
-    mock_page.extract_text.return_value = ""  # Empty text
-    mock_pdf_reader.pages = [mock_page]
-    
-    with patch('PyPDF2.PdfReader', return_value=mock_pdf_reader):
-        # Make fitz (PyMuPDF) also fail
-        with patch('fitz.open', side_effect=Exception("PyMuPDF error")):
-            # Mock EasyOCR for line 531
-            mock_reader = MagicMock()
-            mock_reader.readtext.return_value = [
-                ([0, 0, 0, 0], "OCR extracted text", 0.99)
-            ]
-            
-            with patch('easyocr.Reader', return_value=mock_reader):
-                # Mock pdf2image to return a PIL image
-                mock_image = MagicMock()
-                with patch('pdf2image.convert_from_path', return_value=[mock_image]):
-                    # Mock extract_data to return a DataFrame
-                    with patch.object(parser, 'extract_data', return_value=pd.DataFrame({"text": ["sample"]})):
-                        # Process the file
-                        result = parser.process_file(str(pdf_file))
-                        
-                        # Since extract_data is mocked to return a DataFrame, result should be a DataFrame
-                        assert isinstance(result, pd.DataFrame)
-
-def test_special_case_for_test_pdf(parser, tmp_path):
-    """Test special case handling for test.pdf (line 555)."""
-    # Create a file named test.pdf
-    pdf_file = tmp_path / "test.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest content")
-    
-    # Make all text extraction methods fail
-    with patch('PyPDF2.PdfReader', side_effect=Exception("PyPDF2 error")):
-        with patch('fitz.open', side_effect=Exception("PyMuPDF error")):
-            with patch('easyocr.Reader', side_effect=Exception("EasyOCR error")):
-                # Process the file - the implementation has special handling for test.pdf
-                result = parser.process_file(str(pdf_file))
-                
-                # For test.pdf, a special DataFrame is returned
-                assert isinstance(result, pd.DataFrame)
-                assert 'invoice_number' in result.columns
-                assert result['invoice_number'].iloc[0] == 'INVOICE'
-
-def test_final_supplier_detection_from_text(parser, tmp_path):
-    """Test final supplier detection from text content (lines 563-564)."""
-    # Create a PDF file
-    pdf_file = tmp_path / "supplier_in_content.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest content")
+    mock_doc.__iter__.side_effect = lambda: iter([mock_page])
     
-    # Mock PyPDF2 to extract text with supplier information
+    mock_pdf_page = MagicMock()
+    mock_pdf_page.extract_text.return_value = case["pypdf_text"]
     mock_pdf_reader = MagicMock()
-    mock_page = MagicMock()
-    mock_page.extract_text.return_value = "Invoice from United Drug Ltd"
-    mock_pdf_reader.pages = [mock_page]
-    
-    with patch('PyPDF2.PdfReader', return_value=mock_pdf_reader):
-        # Mock SupplierDetector to detect the supplier from text
-        with patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value='United Drug'):
-            # Mock extract_data to return a DataFrame when called with the detected supplier
-            with patch.object(parser, 'extract_data', return_value=pd.DataFrame({"invoice_number": ["UD123"]})) as mock_extract:
-                # Process the file
-                result = parser.process_file(str(pdf_file))
-                
-                # Verify that extract_data was called and result is a DataFrame
-                assert mock_extract.called
-                assert isinstance(result, pd.DataFrame)
+    mock_pdf_reader.pages = [mock_pdf_page]
+    
+    mock_ocr_reader = MagicMock()
+    mock_ocr_reader.readtext.return_value = [([0, 0, 0, 0], case["ocr_text"], 0.99)]
+    
+    with ExitStack() as stack:
+        if case["fitz_text"] is None:
+            stack.enter_context(patch('fitz.open', side_effect=Exception("PyMuPDF error")))
+        else:
+            stack.enter_context(patch('fitz.open', return_value=mock_doc))
+        stack.enter_context(patch('PyPDF2.PdfReader', return_value=mock_pdf_reader))
+        stack.enter_context(patch('src.parsers.gpt_invoice_parser.EASYOCR_AVAILABLE', True))
+        stack.enter_context(patch('src.parsers.gpt_invoice_parser._get_ocr_reader', return_value=mock_ocr_reader))
+        mock_extract = stack.enter_context(
+            patch.object(parser, 'extract_data', return_value=pd.DataFrame({"invoice_number": ["TEST001"]}))
+        )
+        yield case, str(pdf_file), mock_extract
+
+@pytest.mark.parametrize("pdf_mocks", list(PDF_FALLBACK_CASES), indirect=True)
+def test_pdf_fallback_chain(parser, pdf_mocks):
+    """Test each stage of the PDF fallback chain: PyMuPDF, PyPDF2, EasyOCR and the test.pdf stub."""
+    case, pdf_path, mock_extract = pdf_mocks
+    
+    result = parser.process_file(pdf_path)
+    
+    if case["expected_text"] is not None:
+        # Text from the first extractor that succeeded is passed on for extraction
+        assert isinstance(result, pd.DataFrame)
+        assert mock_extract.call_args[0][0].strip() == case["expected_text"]
+    elif case["filename"] == "test.pdf":
+        # For test.pdf, a special DataFrame is returned
+        assert isinstance(result, pd.DataFrame)
+        assert result['invoice_number'].iloc[0] == 'INVOICE'
+        assert not mock_extract.called
+    else:
+        # The implementation returns None when PDF extraction fails
+        assert result is None
+        assert not mock_extract.called
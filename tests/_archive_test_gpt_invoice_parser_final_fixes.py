@@ -1,73 +1,61 @@
-import pytest
 import os
 import pandas as pd
 from unittest.mock import patch, MagicMock, mock_open
+from contextlib import ExitStack, contextmanager
 
 from src.parsers.gpt_invoice_parser import GPTInvoiceParser
 
-@pytest.fixture
-def parser():
-    return GPTInvoiceParser(api_key="test_key")
+# extract_data results shared by the supplier PDF tests; only ever read
+_DF_SPECIAL = pd.DataFrame({"invoice_number": ["SP123"], "supplier_name": ["Special Supplier"]})
+_DF_UD = pd.DataFrame({"invoice_number": ["UD123"], "supplier_name": ["United Drug"]})
 
-def test_pdf_special_supplier_detection(parser, tmp_path):
+@contextmanager
+def _patched_parser(parser, pdf_reader, supplier, df):
+    """Patch the PDF pipeline so process_file reads from ``pdf_reader`` and returns ``df``.
+    
+    PyMuPDF yields no text so processing falls through to the mocked PyPDF2
+    reader. Yields the extract_data mock.
+    """
+    mock_doc = MagicMock()
+    mock_doc.__iter__.return_value = []
+    
+    with ExitStack() as stack:
+        # The file never exists on disk
+        stack.enter_context(patch('os.path.exists', return_value=True))
+        stack.enter_context(patch('os.path.isfile', return_value=True))
+        stack.enter_context(patch('fitz.open', return_value=mock_doc))
+        stack.enter_context(patch('PyPDF2.PdfReader', return_value=pdf_reader))
+        stack.enter_context(patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value=supplier))
+        yield stack.enter_context(patch.object(parser, 'extract_data', return_value=df))
+
+def test_pdf_special_supplier_detection(parser, mock_pdf_reader_special):
     """Test PDF processing with supplier detection directly from mock PDF reader."""
-    # Create a test PDF file
-    pdf_file = tmp_path / "special_supplier.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
+    # Create a test PDF file path (doesn't need to exist)
+    test_file = "/tmp/special_supplier.pdf"
     
-    # Mock PyPDF2.PdfReader to return a reader with supplier info in extracted text
-    mock_reader = MagicMock()
-    mock_page = MagicMock()
-    mock_page.extract_text.return_value = "Invoice from Special Supplier Ltd"
-    mock_reader.pages = [mock_page]
+    with _patched_parser(parser, mock_pdf_reader_special, 'Special Supplier', _DF_SPECIAL) as mock_extract:
+        # Process the file
+        result = parser.process_file(test_file)
     
-    # Patch PyPDF2.PdfReader
-    with patch('PyPDF2.PdfReader', return_value=mock_reader):
-        # Patch SupplierDetector to detect our supplier
-        with patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value='Special Supplier'):
-            # Mock extract_data to return a test DataFrame
-            with patch.object(parser, 'extract_data', return_value=pd.DataFrame({
-                "invoice_number": ["SP123"],
-                "supplier_name": ["Special Supplier"]
-            })) as mock_extract:
-                # Run the process_file method
-                result = parser.process_file(str(pdf_file))
-                
-                # Verify extract_data was called with the right supplier
-                assert mock_extract.called
-                # Check the result
-                assert isinstance(result, pd.DataFrame)
+        # Verify extract_data was called and result is a DataFrame
+        assert mock_extract.called
+        assert isinstance(result, pd.DataFrame)
 
-def test_united_drug_supplier_in_pdf(parser, tmp_path):
+def test_united_drug_supplier_in_pdf(parser, mock_pdf_reader_united_drug):
     """Test United Drug supplier detection from PDF content."""
-    # Create a test PDF file
-    pdf_file = tmp_path / "united_drug.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
+    # Create a test PDF file path (doesn't need to exist)
+    test_file = "/tmp/united_drug.pdf"
+    
+    with _patched_parser(parser, mock_pdf_reader_united_drug, 'United Drug', _DF_UD) as mock_extract:
+        # Process the file
+        result = parser.process_file(test_file)
     
-    # Create a mock with United Drug text content
-    mock_reader = MagicMock()
-    mock_page = MagicMock()
-    mock_page.extract_text.return_value = "Invoice from United Drug Ltd"
-    mock_reader.pages = [mock_page]
+        # Verify extract_data was called and result is a DataFrame
+        assert mock_extract.called
+        assert isinstance(result, pd.DataFrame)
     
-    # Patch the PdfReader constructor
-    with patch('PyPDF2.PdfReader', return_value=mock_reader):
-        # Patch supplier detection to return our target supplier
-        with patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value='United Drug'):
-            # Mock extract_data to return a DataFrame
-            with patch.object(parser, 'extract_data', return_value=pd.DataFrame({
-                "invoice_number": ["UD123"],
-                "supplier_name": ["United Drug"]
-            })) as mock_extract:
-                # Process the file
-                result = parser.process_file(str(pdf_file))
-                
-                # Check if extract_data was called and result is a DataFrame
-                assert mock_extract.called
-                assert isinstance(result, pd.DataFrame)
-                
-                # Check supplier was detected correctly
-                assert result['supplier_name'].iloc[0] == 'United Drug'
+        # Check supplier was detected correctly
+        assert result['supplier_name'].iloc[0] == 'United Drug'
 
 def test_fehilys_supplier_detection(parser, tmp_path):
     """Test Fehily's supplier detection with apostrophe in filename."""
@@ -132,17 +120,15 @@ def test_process_directory_recursive(parser, tmp_path):
             return pd.DataFrame({"invoice_number": ["SUB1"]})
         return None
     
-    # Mock glob.glob to make sure it finds our files
-    def mock_glob(pattern):
-        if pattern.endswith('.txt'):
-            if "subdir" in pattern:
-                return [str(sub_file)]
-            return [str(main_file)]
-        return []
+    # Mock glob.glob to make sure it finds our files, keyed by the exact pattern
+    glob_results = {
+        os.path.join(str(main_dir), "*.txt"): [str(main_file)],
+        os.path.join(str(sub_dir), "*.txt"): [str(sub_file)],
+    }
     
     # Apply the mocks
     with patch.object(parser, 'process_file', side_effect=mock_process):
-        with patch('glob.glob', side_effect=mock_glob):
+        with patch('glob.glob', side_effect=lambda pattern: glob_results.get(pattern, [])):
             # Process the directory
             result = parser.process_directory(str(main_dir))
             
@@ -1,14 +1,32 @@
-import pytest
 import os
-import inspect
 import pandas as pd
 from unittest.mock import patch, MagicMock
+from contextlib import ExitStack, contextmanager
 
 from src.parsers.gpt_invoice_parser import GPTInvoiceParser
 
-@pytest.fixture
-def parser():
-    return GPTInvoiceParser(api_key="test_key")
+# extract_data results shared by the supplier PDF tests; only ever read
+_DF_SPECIAL = pd.DataFrame({"invoice_number": ["SP123"], "supplier_name": ["Special Supplier"]})
+_DF_UD = pd.DataFrame({"invoice_number": ["UD123"], "supplier_name": ["United Drug"]})
+
+@contextmanager
+def _patched_parser(parser, pdf_reader, supplier, df):
+    """Patch the PDF pipeline so process_file reads from ``pdf_reader`` and returns ``df``.
+    
+    PyMuPDF yields no text so processing falls through to the mocked PyPDF2
+    reader. Yields the extract_data mock.
+    """
+    mock_doc = MagicMock()
+    mock_doc.__iter__.return_value = []
+    
+    with ExitStack() as stack:
+        # The file never exists on disk
+        stack.enter_context(patch('os.path.exists', return_value=True))
+        stack.enter_context(patch('os.path.isfile', return_value=True))
+        stack.enter_context(patch('fitz.open', return_value=mock_doc))
+        stack.enter_context(patch('PyPDF2.PdfReader', return_value=pdf_reader))
+        stack.enter_context(patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value=supplier))
+        yield stack.enter_context(patch.object(parser, 'extract_data', return_value=df))
 
 def test_supplier_detection_in_process_file(parser, tmp_path):
     """Test supplier detection logic in process_file method."""
@@ -40,7 +58,7 @@ def test_supplier_detection_in_process_file(parser, tmp_path):
             supplier_type = call_args[1].lower()
             assert "fehil" in supplier_type or "feehil" in supplier_type
 
-def test_constructor_options():
+def test_constructor_options(parser_init_signature):
     """Test GPTInvoiceParser constructor with different options."""
     # Test with API key explicitly provided
     parser = GPTInvoiceParser(api_key="custom_key")
@@ -48,136 +66,82 @@ def test_constructor_options():
     
     # Test with default model (no need to specify if not supported)
     # Check if model parameter exists in the constructor
-    init_signature = inspect.signature(GPTInvoiceParser.__init__)
-    if 'model' in init_signature.parameters:
+    if 'model' in parser_init_signature.parameters:
         # Only test this if the model parameter exists
         parser = GPTInvoiceParser(api_key="test_key", model="gpt-3.5-turbo")
         assert parser.model == "gpt-3.5-turbo"
 
-def test_pymupdf_extraction(parser, tmp_path):
+def test_pymupdf_extraction(parser):
     """Test fitz (PyMuPDF) PDF extraction."""
-    # Create a valid PDF file
-    pdf_file = tmp_path / "test_pymupdf.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest content")
+    # Create a test PDF file path (doesn't need to exist)
+    test_file = "/tmp/test_pymupdf.pdf"
     
-    # Mock PyPDF2 to fail first (this will cause PyMuPDF to be used as fallback)
-    with patch('PyPDF2.PdfReader', side_effect=Exception("PyPDF2 error")):
-        # Mock fitz (PyMuPDF) document
-        mock_doc = MagicMock()
-        mock_page = MagicMock()
-        mock_page.get_text.return_value = "Extracted text from PyMuPDF"
-        # Use __iter__ to make it iterable (needed if the code loops through pages)
-        mock_doc.__iter__.return_value = [mock_page]
-        # Also support direct indexing which might be used
-        mock_doc.__getitem__.return_value = mock_page
-        # Set length if needed
-        mock_doc.__len__.return_value = 1
+    # Mock the file existence checks
+    with patch('os.path.exists', return_value=True), patch('os.path.isfile', return_value=True):
+        # Mock PyPDF2 to fail first (this will cause PyMuPDF to be used as fallback)
+        with patch('PyPDF2.PdfReader', side_effect=Exception("PyPDF2 error")):
+            # Mock fitz (PyMuPDF) document
+            mock_doc = MagicMock()
+            mock_page = MagicMock()
+            mock_page.get_text.return_value = "Extracted text from PyMuPDF"
+            # Use __iter__ to make it iterable (needed if the code loops through pages)
+            mock_doc.__iter__.return_value = [mock_page]
+            # Also support direct indexing which might be used
+            mock_doc.__getitem__.return_value = mock_page
+            # Set length if needed
+            mock_doc.__len__.return_value = 1
         
-        # Now patch fitz.open to return our mock document
-        with patch('fitz.open', return_value=mock_doc):
-            # Mock extract_data to return a valid DataFrame
-            with patch.object(parser, 'extract_data', return_value=pd.DataFrame({"invoice_number": ["PDF123"]})) as mock_extract:
-                # Process the file
-                result = parser.process_file(str(pdf_file))
+            # Now patch fitz.open to return our mock document
+            with patch('fitz.open', return_value=mock_doc):
+                # Mock extract_data to return a valid DataFrame
+                with patch.object(parser, 'extract_data', return_value=pd.DataFrame({"invoice_number": ["PDF123"]})) as mock_extract:
+                    # Process the file
+                    result = parser.process_file(test_file)
                 
-                # Verify our mocks were called correctly
-                assert mock_extract.called
-                assert isinstance(result, pd.DataFrame)
+                    # Verify our mocks were called correctly
+                    assert mock_extract.called
+                    assert isinstance(result, pd.DataFrame)
 
-def test_pdf_with_special_supplier(parser, tmp_path):
+def test_pdf_with_special_supplier(parser, mock_pdf_reader_special):
     """Test processing PDF with special supplier detection."""
-    # Create a PDF file with valid PDF header
-    pdf_file = tmp_path / "special_supplier.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
+    # Create a test PDF file path (doesn't need to exist)
+    test_file = "/tmp/special_supplier.pdf"
     
-    # Create a PyPDF2 mock that returns text with supplier info
-    mock_pdf_reader = MagicMock()
-    mock_page = MagicMock()
-    mock_page.extract_text.return_value = "Invoice from Special Supplier Ltd"
-    mock_pdf_reader.pages = [mock_page]
+    with _patched_parser(parser, mock_pdf_reader_special, 'Special Supplier', _DF_SPECIAL) as mock_extract:
+        # Process the file
+        result = parser.process_file(test_file)
     
-    # First patch PyPDF2.PdfReader to return our mock reader
-    with patch('PyPDF2.PdfReader', return_value=mock_pdf_reader):
-        # Mock supplier detection to return a specific supplier
-        with patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value='Special Supplier'):
-            # Mock extract_data to return a valid DataFrame
-            with patch.object(parser, 'extract_data', return_value=pd.DataFrame({
-                "invoice_number": ["SP123"],
-                "supplier_name": ["Special Supplier"]
-            })) as mock_extract:
-                # Process the file
-                result = parser.process_file(str(pdf_file))
-                
-                # Verify our extract_data mock was called
-                assert mock_extract.called
-                # Verify result is a DataFrame
-                assert isinstance(result, pd.DataFrame)
+        # Verify extract_data was called and result is a DataFrame
+        assert mock_extract.called
+        assert isinstance(result, pd.DataFrame)
 
-def test_pdf_processing_with_content_supplier_detection(parser, tmp_path):
+def test_pdf_processing_with_content_supplier_detection(parser, mock_pdf_reader_united_drug):
     """Test PDF processing with supplier detection from content."""
-    # Create a PDF file with valid PDF content
-    pdf_file = tmp_path / "supplier_detection.pdf"
-    with open(str(pdf_file), 'wb') as f:
-        f.write(b"%PDF-1.5\nTest PDF content")
+    # Create a test PDF file path (doesn't need to exist)
+    test_file = "/tmp/supplier_detection.pdf"
     
-    # Mock PyPDF2 to extract text with supplier information
-    mock_pdf_reader = MagicMock()
-    mock_page = MagicMock()
-    mock_page.extract_text.return_value = "Invoice from United Drug Ltd"
-    # Mock the pages attribute to be accessible as an iterable
-    mock_pdf_reader.pages = [mock_page]
+    with _patched_parser(parser, mock_pdf_reader_united_drug, 'United Drug', _DF_UD) as mock_extract:
+        # Process the file
+        result = parser.process_file(test_file)
     
-    # First, patch PyPDF2.PdfReader to return our mock
-    with patch('PyPDF2.PdfReader', return_value=mock_pdf_reader):
-        # Mock the supplier detector
-        with patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value='United Drug'):
-            # Mock extract_data to return a valid DataFrame
-            with patch.object(parser, 'extract_data', return_value=pd.DataFrame({
-                "invoice_number": ["UD123"], 
-                "supplier_name": ["United Drug"]
-            })) as mock_extract:
-                # Process the file
-                result = parser.process_file(str(pdf_file))
-                
-                # Verify that extract_data was called and result is a DataFrame
-                assert mock_extract.called
-                assert isinstance(result, pd.DataFrame)
+        # Verify extract_data was called and result is a DataFrame
+        assert mock_extract.called
+        assert isinstance(result, pd.DataFrame)
 
-def test_final_supplier_detection_from_text(parser, tmp_path):
+def test_final_supplier_detection_from_text(parser, mock_pdf_reader_united_drug):
     """Test final supplier detection from text content."""
-    # Create a valid PDF file
-    pdf_file = tmp_path / "supplier_in_content.pdf"
-    with open(str(pdf_file), 'wb') as f:
-        f.write(b"%PDF-1.5\nTest PDF content")
+    # Create a test PDF file path (doesn't need to exist)
+    test_file = "/tmp/supplier_in_content.pdf"
     
-    # Create a mock that will be returned by PyPDF2.PdfReader
-    mock_pdf_reader = MagicMock()
-    mock_page = MagicMock()
-    # Set up text that contains supplier information 
-    mock_page.extract_text.return_value = "Invoice from United Drug Ltd"
-    mock_pdf_reader.pages = [mock_page]
+    with _patched_parser(parser, mock_pdf_reader_united_drug, 'United Drug', _DF_UD) as mock_extract:
+        # Process the file
+        result = parser.process_file(test_file)
     
-    # Patch PyPDF2.PdfReader first
-    with patch('PyPDF2.PdfReader', return_value=mock_pdf_reader):
-        # Now patch the supplier detection
-        with patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value='United Drug'):
-            # And finally patch extract_data to return a valid DataFrame
-            with patch.object(parser, 'extract_data', return_value=pd.DataFrame({
-                "invoice_number": ["UD123"],
-                "supplier_name": ["United Drug"]
-            })) as mock_extract:
-                # Process the file
-                result = parser.process_file(str(pdf_file))
-                
-                # Verify that extract_data was called with the right supplier type
-                assert mock_extract.called
-                
-                # Verify the result
-                assert isinstance(result, pd.DataFrame)
-                
-                # Check that our mock was called as expected
-                # First arg is text content, second might be supplier_type
-                call_args = mock_extract.call_args[0]
-                if len(call_args) > 1 and call_args[1] is not None:
-                    # If supplier detection worked, it should be "United Drug"
-                    assert "united drug" in call_args[1].lower()
+        # Verify extract_data was called and result is a DataFrame
+        assert mock_extract.called
+        assert isinstance(result, pd.DataFrame)
+    
+        # Check supplier type was detected from content
+        call_args = mock_extract.call_args[0]
+        if len(call_args) > 1 and call_args[1] is not None:
+            assert "united drug" in call_args[1].lower()
@@ -1,92 +1,57 @@
 import pytest
 import pandas as pd
 from unittest.mock import patch, MagicMock
+from contextlib import ExitStack, contextmanager
 
 from src.parsers.gpt_invoice_parser import GPTInvoiceParser
 
-@pytest.fixture
-def parser():
-    return GPTInvoiceParser(api_key="test_key")
+# extract_data results shared by the supplier PDF tests; only ever read
+_DF_SPECIAL = pd.DataFrame({"invoice_number": ["SP123"], "supplier_name": ["Special Supplier"]})
+_DF_UD = pd.DataFrame({"invoice_number": ["UD123"], "supplier_name": ["United Drug"]})
 
-def test_pdf_with_special_supplier(parser):
-    """Test processing PDF with special supplier detection by mocking internal methods."""
-    # Create a test PDF file path (doesn't need to exist)
-    test_file = "/tmp/special_supplier.pdf"
+@contextmanager
+def _patched_parser(parser, pdf_reader, supplier, df):
+    """Patch the PDF pipeline so process_file reads from ``pdf_reader`` and returns ``df``.
     
-    # Mock os.path.exists to make the parser think the file exists
-    with patch('os.path.exists', return_value=True):
-        # Mock os.path.isfile to make the parser think it's a file
-        with patch('os.path.isfile', return_value=True):
-            # Mock _extract_text_from_pdf to return text with supplier info
-            with patch.object(parser, '_extract_text_from_pdf', return_value="Invoice from Special Supplier Ltd"):
-                # Mock supplier detector
-                with patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value='Special Supplier'):
-                    # Mock extract_data
-                    with patch.object(parser, 'extract_data', return_value=pd.DataFrame({
-                        "invoice_number": ["SP123"],
-                        "supplier_name": ["Special Supplier"]
-                    })) as mock_extract:
-                        # Process the file
-                        result = parser.process_file(test_file)
-                        
-                        # Verify our extract_data was called
-                        assert mock_extract.called
-                        assert isinstance(result, pd.DataFrame)
-
-def test_pdf_processing_with_content_supplier_detection(parser):
-    """Test PDF processing with supplier detection from content by mocking internal methods."""
-    # Create a test PDF file path (doesn't need to exist)
-    test_file = "/tmp/supplier_detection.pdf"
+    PyMuPDF yields no text so processing falls through to the mocked PyPDF2
+    reader. Yields the extract_data mock.
+    """
+    mock_doc = MagicMock()
+    mock_doc.__iter__.return_value = []
     
-    # Mock the file existence checks
-    with patch('os.path.exists', return_value=True):
-        with patch('os.path.isfile', return_value=True):
-            # Mock internal PDF text extraction method
-            with patch.object(parser, '_extract_text_from_pdf', return_value="Invoice from United Drug Ltd"):
-                # Mock supplier detection
-                with patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value='United Drug'):
-                    # Mock extract_data
-                    with patch.object(parser, 'extract_data', return_value=pd.DataFrame({
-                        "invoice_number": ["UD123"],
-                        "supplier_name": ["United Drug"]
-                    })) as mock_extract:
-                        # Process the file
-                        result = parser.process_file(test_file)
-                        
-                        # Verify extract_data was called
-                        assert mock_extract.called
-                        assert isinstance(result, pd.DataFrame)
+    with ExitStack() as stack:
+        # The file never exists on disk
+        stack.enter_context(patch('os.path.exists', return_value=True))
+        stack.enter_context(patch('os.path.isfile', return_value=True))
+        stack.enter_context(patch('fitz.open', return_value=mock_doc))
+        stack.enter_context(patch('PyPDF2.PdfReader', return_value=pdf_reader))
+        stack.enter_context(patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value=supplier))
+        yield stack.enter_context(patch.object(parser, 'extract_data', return_value=df))
 
-def test_final_supplier_detection_from_text(parser):
-    """Test final supplier detection from text content by mocking internal methods."""
+@pytest.mark.parametrize("pdf_reader_fixture,supplier_name,df,filename,check_supplier_type", [
+    ("mock_pdf_reader_special", "Special Supplier", _DF_SPECIAL, "special_supplier.pdf", False),
+    ("mock_pdf_reader_united_drug", "United Drug", _DF_UD, "supplier_detection.pdf", False),
+    ("mock_pdf_reader_united_drug", "United Drug", _DF_UD, "supplier_in_content.pdf", True),
+], ids=["special_supplier", "content_supplier_detection", "final_supplier_detection_from_text"])
+def test_supplier_detection(parser, request, pdf_reader_fixture, supplier_name, df, filename, check_supplier_type):
+    """Test PDF processing with supplier detection from content by mocking internal methods."""
     # Create a test PDF file path (doesn't need to exist)
-    test_file = "/tmp/supplier_in_content.pdf"
+    test_file = f"/tmp/{filename}"
+    pdf_reader = request.getfixturevalue(pdf_reader_fixture)
     
-    # Mock file system checks
-    with patch('os.path.exists', return_value=True):
-        with patch('os.path.isfile', return_value=True):
-            # Mock PDF text extraction
-            with patch.object(parser, '_extract_text_from_pdf', return_value="Invoice from United Drug Ltd"):
-                # Mock supplier detection
-                with patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value='United Drug'):
-                    # Mock extract_data
-                    with patch.object(parser, 'extract_data', return_value=pd.DataFrame({
-                        "invoice_number": ["UD123"],
-                        "supplier_name": ["United Drug"]
-                    })) as mock_extract:
-                        # Process the file
-                        result = parser.process_file(test_file)
-                        
-                        # Verify extract_data was called with supplier info
-                        assert mock_extract.called
-                        
-                        # Check the result
-                        assert isinstance(result, pd.DataFrame)
-                        
-                        # Check supplier type was passed correctly
-                        call_args = mock_extract.call_args[0]
-                        if len(call_args) > 1 and call_args[1] is not None:
-                            assert "united drug" in call_args[1].lower()
+    with _patched_parser(parser, pdf_reader, supplier_name, df) as mock_extract:
+        # Process the file
+        result = parser.process_file(test_file)
+        
+        # Verify extract_data was called and result is a DataFrame
+        assert mock_extract.called
+        assert isinstance(result, pd.DataFrame)
+        
+        if check_supplier_type:
+            # Check supplier type was detected from content
+            call_args = mock_extract.call_args[0]
+            if len(call_args) > 1 and call_args[1] is not None:
+                assert supplier_name.lower() in call_args[1].lower()
 
 # Add other fixed tests that were working before
 def test_supplier_detection_in_process_file(parser, tmp_path):
@@ -119,7 +84,7 @@ def test_supplier_detection_in_process_file(parser, tmp_path):
             supplier_type = call_args[1].lower()
             assert "fehil" in supplier_type or "feehil" in supplier_type
 
-def test_constructor_options():
+def test_constructor_options(parser_init_signature):
     """Test GPTInvoiceParser constructor with different options."""
     # Test with API key explicitly provided
     parser = GPTInvoiceParser(api_key="custom_key")
@@ -127,9 +92,7 @@ def test_constructor_options():
     
     # Test with default model (no need to specify if not supported)
     # Check if model parameter exists in the constructor
-    import inspect
-    init_signature = inspect.signature(GPTInvoiceParser.__init__)
-    if 'model' in init_signature.parameters:
+    if 'model' in parser_init_signature.parameters:
         # Only test this if the model parameter exists
         parser = GPTInvoiceParser(api_key="test_key", model="gpt-3.5-turbo")
         assert parser.model == "gpt-3.5-turbo"
@@ -1,17 +1,17 @@
+import io
 import pytest
 from pathlib import Path
-import yaml
-from unittest.mock import patch, mock_open, Mock
+from unittest.mock import patch, Mock
 from src.utils.config_manager import ConfigManager
 
-@pytest.fixture(autouse=True)
-def reset_config_manager():
+@pytest.fixture
+def fresh_config():
     """Reset ConfigManager singleton between tests."""
     ConfigManager._instance = None
     ConfigManager._config = None
     yield
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_config():
     return {
         'openai': {
@@ -28,29 +28,31 @@ def sample_config():
         }
     }
 
-def test_singleton_pattern():
+def test_singleton_pattern(fresh_config):
     """Test that ConfigManager follows singleton pattern."""
     config1 = ConfigManager()
     config2 = ConfigManager()
     assert config1 is config2
 
-def test_load_config_success(sample_config):
+def test_load_config_success(fresh_config, sample_config):
     """Test successful config loading."""
-    mock_yaml = yaml.dump(sample_config)
-    with patch('pathlib.Path.open', mock_open(read_data=mock_yaml)):
+    with patch.object(ConfigManager, '_open_config', return_value=io.StringIO()), \
+         patch('yaml.safe_load', return_value=sample_config) as mock_load:
         config = ConfigManager()
+        mock_load.assert_called_once()
         assert config.config == sample_config
 
-def test_load_config_failure():
+def test_load_config_failure(fresh_config):
     """Test config loading failure."""
-    with patch('pathlib.Path.open', side_effect=Exception("Failed to open file")):
+    with patch.object(ConfigManager, '_open_config', side_effect=Exception("Failed to open file")):
         with pytest.raises(Exception) as exc_info:
             ConfigManager()
         assert "Failed to load configuration file" in str(exc_info.value)
 
-def test_get_config_value(sample_config):
+def test_get_config_value(fresh_config, sample_config):
     """Test getting config values."""
-    with patch('pathlib.Path.open', mock_open(read_data=yaml.dump(sample_config))):
+    with patch.object(ConfigManager, '_open_config', return_value=io.StringIO()), \
+         patch('yaml.safe_load', return_value=sample_config):
         config = ConfigManager()
         assert config.get('openai', 'api_key') == 'test_key'
         assert config.get('openai', 'vision', 'model') == 'gpt-4-vision-preview'
@@ -1,41 +1,63 @@
 """Tests for the extract_invoice_data module."""
 
-import os
 import sys
 import pandas as pd
 import pytest
-from unittest.mock import patch, MagicMock
+from pandas.testing import assert_series_equal
+from unittest.mock import patch, MagicMock, mock_open
 
-from src.extract_invoice_data import extract_invoice_data, main
+from src.extract_invoice_data import EXPECTED_COLUMNS, extract_invoice_data, main
+
+
+# Returned by the mocked parser; extract_invoice_data adds columns in place, so tests get a copy
+_SAMPLE_DF = pd.DataFrame({
+    'qty': [1.0],
+    'description': ['Test Item'],
+    'invoice_number': ['INV-001'],
+    'invoice_date': ['01.01.2025']
+})
+
+# Columns extract_invoice_data guarantees in its result
+_EXPECTED_COLUMNS = frozenset({
+    'qty', 'description', 'pack', 'price', 'discount', 'vat', 'invoice_value',
+    'invoice_number', 'account_number', 'invoice_date', 'invoice_time',
+    'invoice_type', 'handled_by', 'our_ref', 'delivery_no', 'your_ref',
+    'supplier_name', 'supplier_address', 'supplier_tel', 'supplier_fax',
+    'supplier_email', 'customer_name', 'customer_address', 'goods_value',
+    'vat_code', 'vat_rate_percent', 'vat_amount', 'total_amount', 'batch',
+    'expiry_date'
+})
+
+
+# Class stand-ins built once; each test that needs them patches them in for itself
+_CONFIG_CLASS = MagicMock()
+_PARSER_CLASS = MagicMock()
 
 
 @pytest.fixture
-def mock_config():
+def mock_config(monkeypatch):
     """Mock ConfigManager fixture."""
-    with patch('src.extract_invoice_data.ConfigManager') as mock_config_class:
-        mock_conf = MagicMock()
-        mock_conf.get.return_value = "test_api_key"
-        mock_config_class.return_value = mock_conf
-        yield mock_conf
+    _CONFIG_CLASS.reset_mock()
+    monkeypatch.setattr('src.extract_invoice_data.ConfigManager', _CONFIG_CLASS)
+    mock_conf = _CONFIG_CLASS.return_value
+    mock_conf.get.return_value = "test_api_key"
+    return mock_conf
 
 
 @pytest.fixture
-def mock_parser():
+def mock_parser(monkeypatch):
     """Mock GPTInvoiceParser fixture."""
-    with patch('src.extract_invoice_data.GPTInvoiceParser') as mock_parser_class:
-        mock_p = MagicMock()
-        
-        # Setup sample DataFrame to be returned by extract_data
-        sample_df = pd.DataFrame({
-            'qty': [1.0],
-            'description': ['Test Item'],
-            'invoice_number': ['INV-001'],
-            'invoice_date': ['01.01.2025']
-        })
-        
-        mock_p.extract_data.return_value = sample_df
-        mock_parser_class.return_value = mock_p
-        yield mock_p
+    _PARSER_CLASS.reset_mock()
+    monkeypatch.setattr('src.extract_invoice_data.GPTInvoiceParser', _PARSER_CLASS)
+    mock_p = _PARSER_CLASS.return_value
+    mock_p.extract_data.return_value = _SAMPLE_DF.copy()
+    return mock_p
+
+
+def test_expected_columns_schema():
+    """Test that the output schema matches the documented invoice columns."""
+    assert frozenset(EXPECTED_COLUMNS) == _EXPECTED_COLUMNS
+    assert len(EXPECTED_COLUMNS) == len(_EXPECTED_COLUMNS)
 
 
 def test_extract_invoice_data_success(mock_config, mock_parser):
@@ -46,23 +68,15 @@ def test_extract_invoice_data_success(mock_config, mock_parser):
     # Verify the result is a DataFrame with expected columns
     assert isinstance(result, pd.DataFrame)
     
-    # Check that all expected columns are in the result
-    expected_columns = [
-        'qty', 'description', 'pack', 'price', 'discount', 'vat', 'invoice_value',
-        'invoice_number', 'account_number', 'invoice_date', 'invoice_time',
-        'invoice_type', 'handled_by', 'our_ref', 'delivery_no', 'your_ref',
-        'supplier_name', 'supplier_address', 'supplier_tel', 'supplier_fax',
-        'supplier_email', 'customer_name', 'customer_address', 'goods_value',
-        'vat_code', 'vat_rate_percent', 'vat_amount', 'total_amount', 'batch',
-        'expiry_date'
-    ]
-    for col in expected_columns:
-        assert col in result.columns
+    # Check that the result has exactly the expected columns, in output order
+    assert list(result.columns) == EXPECTED_COLUMNS
     
     # Check that values from mock parser are present
-    assert result['qty'].iloc[0] == 1.0
-    assert result['description'].iloc[0] == 'Test Item'
-    assert result['invoice_number'].iloc[0] == 'INV-001'
+    assert_series_equal(
+        result[['qty', 'description', 'invoice_number']].iloc[0],
+        pd.Series({'qty': 1.0, 'description': 'Test Item', 'invoice_number': 'INV-001'}),
+        check_dtype=False, check_names=False
+    )
     
     # Verify parser was called with correct text
     mock_parser.extract_data.assert_called_once_with("Sample invoice text")
@@ -107,26 +121,26 @@ def test_extract_invoice_data_exception(mock_config):
 
 def test_main_success(tmp_path, mock_config, mock_parser, monkeypatch):
     """Test main function with successful execution."""
-    # Create test input file
-    input_file = tmp_path / "test_input.txt"
-    input_file.write_text("Sample invoice text")
-    
     # Create test output file name
     output_file = tmp_path / "test_output.xlsx"
     
     # Mock sys.argv
-    test_args = ["extract_invoice_data.py", str(input_file), str(output_file)]
+    test_args = ["extract_invoice_data.py", "test_input.txt", str(output_file)]
     monkeypatch.setattr(sys, 'argv', test_args)
     
-    # Call the main function
-    with patch('builtins.print') as mock_print:
+    # Call the main function, serving the input file from memory
+    with patch('src.extract_invoice_data.open', mock_open(read_data="Sample invoice text"), create=True), \
+         patch('builtins.print') as mock_print:
         result = main()
     
     # Verify the result is 0 (success)
     assert result == 0
-    
+
+    # The in-memory input reached the parser
+    mock_parser.extract_data.assert_called_once_with("Sample invoice text")
+
     # Verify the output file was created
-    assert os.path.exists(output_file)
+    assert output_file.exists()
     
     # Verify print was called with success message
     mock_print.assert_any_call(f"Successfully extracted invoice data to {output_file}")
@@ -160,18 +174,15 @@ def test_main_file_not_found(monkeypatch):
     assert result == 1
 
 
-def test_main_parser_failure(tmp_path, mock_config, monkeypatch):
+def test_main_parser_failure(mock_config, monkeypatch):
     """Test main function with parser failure."""
-    # Create test input file
-    input_file = tmp_path / "test_input.txt"
-    input_file.write_text("Sample invoice text")
-    
     # Mock sys.argv
-    test_args = ["extract_invoice_data.py", str(input_file)]
+    test_args = ["extract_invoice_data.py", "test_input.txt"]
     monkeypatch.setattr(sys, 'argv', test_args)
     
-    # Mock extract_invoice_data to return None
-    with patch('src.extract_invoice_data.extract_invoice_data', return_value=None):
+    # Mock extract_invoice_data to return None, serving the input file from memory
+    with patch('src.extract_invoice_data.open', mock_open(read_data="Sample invoice text"), create=True), \
+         patch('src.extract_invoice_data.extract_invoice_data', return_value=None):
         # Call the main function
         result = main()
     
@@ -14,220 +14,98 @@ def test_config_constants():
     assert config.INVOICE_ITEM_MIN_LENGTH > 0
 
 
-def test_telephone_patterns():
-    """Test that telephone patterns match expected formats."""
-    assert isinstance(config.TELEPHONE_PATTERNS, list)
-    assert len(config.TELEPHONE_PATTERNS) > 0
-    
-    # Test some valid telephone number formats
-    test_texts = [
+# Pattern lists with texts each must match; patterns with a capture group must also capture a value
+_PATTERN_CASES = {
+    "TELEPHONE_PATTERNS": [
         "Tel: +1 (555) 123-4567",
         "Telephone: 555-123-4567",
         "Phone: 5551234567",
         "T: +44 20 7123 4567"
-    ]
-    
-    for text in test_texts:
-        matches = False
-        for pattern in config.TELEPHONE_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                matches = True
-                break
-        assert matches, f"Pattern should match: {text}"
-
-
-def test_email_patterns():
-    """Test that email patterns match expected formats."""
-    assert isinstance(config.EMAIL_PATTERNS, list)
-    assert len(config.EMAIL_PATTERNS) > 0
-    
-    # Test some valid email formats
-    test_texts = [
+    ],
+    "EMAIL_PATTERNS": [
         "Email: test@example.com",
         "E-mail: support@company.co.uk",
         "E: info@domain.org",
         "Contact us at sales@business.net"
-    ]
-    
-    for text in test_texts:
-        matches = False
-        for pattern in config.EMAIL_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                matches = True
-                break
-        assert matches, f"Pattern should match: {text}"
-
-
-def test_invoice_number_patterns():
-    """Test that invoice number patterns match expected formats."""
-    assert isinstance(config.INVOICE_NUMBER_PATTERNS, list)
-    assert len(config.INVOICE_NUMBER_PATTERNS) > 0
-    
-    # Test some valid invoice number formats
-    test_texts = [
+    ],
+    "INVOICE_NUMBER_PATTERNS": [
         "Invoice #: INV-2023-001",
         "Invoice No.: 10057893",
         "Invoice Number: ABC/12345",
         "Invoice: 2023-05-001",
         "INV #: 123456"
-    ]
-    
-    for text in test_texts:
-        matches = False
-        for pattern in config.INVOICE_NUMBER_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match and match.group(1):
-                matches = True
-                break
-        assert matches, f"Pattern should match: {text}"
-
-
-def test_date_patterns():
-    """Test that date patterns match expected formats."""
-    assert isinstance(config.DATE_PATTERNS, list)
-    assert len(config.DATE_PATTERNS) > 0
-    
-    # Test some valid date formats
-    test_texts = [
+    ],
+    "DATE_PATTERNS": [
         "Invoice Date: 01/15/2023",
         "Date: 15-01-2023",
         "Date: 15.01.2023",
         "Date: 15th January 2023",
         "Date: Jan 15, 2023"
-    ]
-    
-    for text in test_texts:
-        matches = False
-        for pattern in config.DATE_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match and match.group(1):
-                matches = True
-                break
-        assert matches, f"Pattern should match: {text}"
-
-
-def test_financial_patterns():
-    """Test that financial amount patterns match expected formats."""
-    # Test subtotal patterns
-    assert isinstance(config.SUBTOTAL_PATTERNS, list)
-    assert len(config.SUBTOTAL_PATTERNS) > 0
-    
-    # Test total patterns
-    assert isinstance(config.TOTAL_PATTERNS, list)
-    assert len(config.TOTAL_PATTERNS) > 0
-    
-    # Test some valid financial amounts
-    test_texts = [
+    ],
+    "SUBTOTAL_PATTERNS": [
         "Subtotal: $100.00",
         "Sub-total: 100.00",
-        "Total before tax: EUR 100.00",
+        "Total before tax: EUR 100.00"
+    ],
+    "TAX_PATTERNS": [
         "VAT: £20.00",
         "Tax: 20.00",
-        "GST: $10.50",
+        "GST: $10.50"
+    ],
+    "TOTAL_PATTERNS": [
         "Total: 120.00",
         "Grand Total: USD 120.00",
         "Amount Due: $120.00"
-    ]
-    
-    all_patterns = (
-        config.SUBTOTAL_PATTERNS + 
-        config.TAX_PATTERNS + 
-        config.TOTAL_PATTERNS
-    )
-    
-    for text in test_texts:
-        matches = False
-        for pattern in all_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match and match.group(1):
-                matches = True
-                break
-        assert matches, f"Some financial pattern should match: {text}"
-
-
-def test_item_patterns():
-    """Test that item patterns match expected formats."""
-    # Test item header patterns
-    assert isinstance(config.ITEM_HEADER_PATTERNS, list)
-    assert len(config.ITEM_HEADER_PATTERNS) > 0
-    
-    # Test item quantity patterns
-    assert isinstance(config.ITEM_QTY_PATTERNS, list)
-    assert len(config.ITEM_QTY_PATTERNS) > 0
-    
-    # Test some valid item headers
-    header_texts = [
+    ],
+    "ITEM_HEADER_PATTERNS": [
         "QTY DESCRIPTION PRICE AMOUNT",
         "QUANTITY ITEM UNIT PRICE AMOUNT",
         "QTY ITEM PRICE DISC VAT AMOUNT"
-    ]
-    
-    for text in header_texts:
-        matches = False
-        for pattern in config.ITEM_HEADER_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                matches = True
-                break
-        assert matches, f"Item header pattern should match: {text}"
-    
-    # Test some valid item quantity formats
-    qty_texts = [
+    ],
+    "ITEM_QTY_PATTERNS": [
         "5 Widget A",
         "10.5 Service hours",
         "3__ Premium Widget"
-    ]
-    
-    for text in qty_texts:
-        matches = False
-        for pattern in config.ITEM_QTY_PATTERNS:
-            match = re.match(pattern, text)
-            if match and match.group(1):
-                matches = True
-                break
-        assert matches, f"Item quantity pattern should match: {text}"
-
-
-def test_batch_and_expiry_patterns():
-    """Test that batch and expiry patterns match expected formats."""
-    # Test batch patterns
-    assert isinstance(config.BATCH_PATTERNS, list)
-    assert len(config.BATCH_PATTERNS) > 0
-    
-    # Test expiry patterns
-    assert isinstance(config.EXPIRY_PATTERNS, list)
-    assert len(config.EXPIRY_PATTERNS) > 0
-    
-    # Test some valid batch formats
-    batch_texts = [
+    ],
+    "BATCH_PATTERNS": [
         "Batch: ABC123",
         "Lot No: XYZ-456",
         "Batch No: 20230501-A"
-    ]
-    
-    for text in batch_texts:
-        matches = False
-        for pattern in config.BATCH_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match and match.group(1):
-                matches = True
-                break
-        assert matches, f"Batch pattern should match: {text}"
-    
-    # Test some valid expiry formats
-    expiry_texts = [
+    ],
+    "EXPIRY_PATTERNS": [
         "Expiry: 01/05/2025",
         "Expiration Date: 2025-05-01",
         "Exp: May 1, 2025"
-    ]
-    
-    for text in expiry_texts:
-        matches = False
-        for pattern in config.EXPIRY_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match and match.group(1):
-                matches = True
-                break
-        assert matches, f"Expiry pattern should match: {text}"
+    ],
+}
+
+
+@pytest.mark.parametrize("name", list(_PATTERN_CASES))
+def test_pattern_lists_defined(name):
+    """Test that each pattern group is a non-empty tuple of compiled patterns."""
+    patterns = getattr(config, name)
+    assert isinstance(patterns, tuple)
+    assert all(isinstance(pattern, re.Pattern) for pattern in patterns)
+    assert len(patterns) > 0
+
+
+@pytest.mark.parametrize("name, text", [
+    (name, text) for name, texts in _PATTERN_CASES.items() for text in texts
+])
+def test_pattern_matches(name, text):
+    """Test that some pattern in the list matches the text."""
+    # ITEM_QTY_PATTERNS are anchored with ^, so search behaves like the parser's match
+    assert any(
+        (match := pattern.search(text)) and (not pattern.groups or match.group(1))
+        for pattern in getattr(config, name)
+    ), f"{name} should match: {text}"
+
+
+def test_item_header_combined():
+    """Test that the combined header regex agrees with scanning the list."""
+    for text in _PATTERN_CASES["ITEM_HEADER_PATTERNS"] + ["qty description price amount", "Invoice Number: 123", "QTY 5"]:
+        expected = any(pattern.search(text) for pattern in config.ITEM_HEADER_PATTERNS)
+        assert bool(config.ITEM_HEADER_COMBINED.search(text)) == expected, text
 
 
 def test_section_markers():
@@ -1,6 +1,5 @@
 """Test generator interface module."""
 import pytest
-from unittest.mock import patch, Mock
 from src.interfaces.generator_interface import GeneratorInterface
 import re
 
@@ -73,7 +72,7 @@ class TestExcelGeneratorInterface:
                 self.log.append(f"Error creating Excel file: {str(e)}")
                 return False
     
-    def test_excel_generator_with_logging(self):
+    def test_excel_generator_with_logging(self, monkeypatch):
         """Test Excel generator with logging."""
         generator = self.ExcelGeneratorWithLogging()
         
@@ -97,8 +96,6 @@ class TestExcelGeneratorInterface:
         assert any("No data provided" in entry for entry in generator.log)
         
         # Test with error simulation
-        generator.log = []  # Reset log
-        
         # Create a new instance to avoid patching the method we're testing
         error_generator = self.ExcelGeneratorWithLogging()
         
@@ -107,14 +104,10 @@ class TestExcelGeneratorInterface:
             error_generator.log.append("Error creating Excel file: Test error")
             raise Exception("Test error")
             
-        # Replace the original method temporarily
-        original_method = error_generator.create_excel
-        error_generator.create_excel = trigger_error
+        monkeypatch.setattr(error_generator, 'create_excel', trigger_error)
         
-        try:
+        with pytest.raises(Exception, match="Test error"):
             error_generator.create_excel(data, "error.xlsx")
-        except Exception:
-            pass  # Exception will be raised but we don't need to handle it
         
         # The log should contain the error
         assert any("Test error" in entry for entry in error_generator.log)
@@ -127,6 +120,9 @@ class TestGeneratorEdgeCases:
     class EdgeCaseGenerator(GeneratorInterface):
         """Generator implementation focusing on edge cases."""
         
+        # Characters Excel doesn't allow in sheet names
+        _BAD_SHEET_CHARS = re.compile(r'[\[\]*?:/\\]')
+        
         def create_excel(self, data, output_path):
             """Handle edge cases in Excel creation."""
             # Handle None data
@@ -148,36 +144,30 @@ class TestGeneratorEdgeCases:
                     return False
                     
                 # Excel doesn't allow certain characters in sheet names
-                if any(c in str(sheet_name) for c in r'[]*?:/\\'):
+                if self._BAD_SHEET_CHARS.search(str(sheet_name)):
                     return False
             
             return True
     
-    def test_generator_edge_cases(self):
+    @pytest.fixture
+    def generator(self):
+        """Fresh edge case generator for each case."""
+        return self.EdgeCaseGenerator()
+    
+    @pytest.mark.parametrize("data, output_path, expected", [
+        pytest.param(None, "test.xlsx", False, id="none_data"),
+        pytest.param(["list", "not", "dict"], "test.xlsx", False, id="non_dict_data"),
+        pytest.param({}, None, False, id="none_path"),
+        pytest.param({}, 123, False, id="non_str_path"),
+        pytest.param({"Sheet1": [{"col1": "value1"}]}, "test.xlsx", True, id="valid"),
+        pytest.param({"A" * 32: [{"col1": "value1"}]}, "test.xlsx", False, id="long_sheet_name"),
+        pytest.param({"Sheet*1": [{"col1": "value1"}]}, "test.xlsx", False, id="invalid_sheet_chars"),
+        pytest.param({"Sheet/1": [{"col1": "value1"}]}, "test.xlsx", False, id="slash_in_sheet_name"),
+        pytest.param({"Sheet\\1": [{"col1": "value1"}]}, "test.xlsx", False, id="backslash_in_sheet_name"),
+    ])
+    def test_generator_edge_cases(self, generator, data, output_path, expected):
         """Test edge case handling in generator."""
-        generator = self.EdgeCaseGenerator()
-        
-        # Test None data
-        assert generator.create_excel(None, "test.xlsx") is False
-        
-        # Test non-dict data
-        assert generator.create_excel(["list", "not", "dict"], "test.xlsx") is False
-        
-        # Test invalid output path
-        assert generator.create_excel({}, None) is False
-        assert generator.create_excel({}, 123) is False
-        
-        # Test valid data with valid path
-        valid_data = {"Sheet1": [{"col1": "value1"}]}
-        assert generator.create_excel(valid_data, "test.xlsx") is True
-        
-        # Test data with long sheet name
-        long_sheet_name = {"A" * 32: [{"col1": "value1"}]}
-        assert generator.create_excel(long_sheet_name, "test.xlsx") is False
-        
-        # Test data with invalid sheet name characters
-        invalid_sheet_name = {"Sheet*1": [{"col1": "value1"}]}
-        assert generator.create_excel(invalid_sheet_name, "test.xlsx") is False
+        assert generator.create_excel(data, output_path) is expected
 
 
 class TestGeneratorInterfaceEdgeCases:
@@ -186,6 +176,9 @@ class TestGeneratorInterfaceEdgeCases:
     class EdgeCaseGenerator(GeneratorInterface):
         """Generator that handles various edge cases."""
         
+        # Characters treated as illegal in output paths
+        _ILLEGAL_PATH_CHARS = re.compile(r'[*?<>|":]')
+        
         def __init__(self):
             """Initialize with error tracking."""
             self.errors = []
@@ -219,8 +212,7 @@ class TestGeneratorInterfaceEdgeCases:
                 return False
                 
             # Check for illegal characters in path (basic simulation)
-            illegal_chars = ['*', '?', '<', '>', '|', '"', ':']
-            if any(char in output_path for char in illegal_chars):
+            if self._ILLEGAL_PATH_CHARS.search(output_path):
                 self.errors.append(f"Output path contains illegal characters: {output_path}")
                 return False
                 
@@ -237,48 +229,33 @@ class TestGeneratorInterfaceEdgeCases:
             # Success case
             return True
     
-    def test_generator_edge_cases(self):
+    @pytest.fixture
+    def generator(self):
+        """Fresh generator, with an empty error log, for each case."""
+        return self.EdgeCaseGenerator()
+    
+    @pytest.mark.parametrize("data, output_path, error", [
+        pytest.param(None, "output.xlsx", "Null data received", id="none_data"),
+        pytest.param("string data", "output.xlsx", "Invalid data type", id="wrong_data_type"),
+        pytest.param({}, "output.xlsx", "Empty data dictionary", id="empty_data"),
+        pytest.param({"data": "value"}, None, "Null output path", id="none_path"),
+        pytest.param({"data": "value"}, 123, "Invalid output path type", id="wrong_path_type"),
+        pytest.param({"data": "value"}, "", "Empty output path", id="empty_path"),
+        pytest.param({"data": "value"}, "output*.xlsx", "Output path contains illegal characters", id="illegal_chars"),
+        pytest.param({"data": "value"}, "output.txt", "Output path must end with .xlsx or .xls", id="wrong_extension"),
+        pytest.param({"data": "value"}, "error.xlsx", "Simulated error in file creation", id="simulated_error"),
+        pytest.param({"data": "value"}, "valid.xlsx", None, id="valid"),
+    ])
+    def test_generator_edge_cases(self, generator, data, output_path, error):
         """Test generator with edge cases."""
-        generator = self.EdgeCaseGenerator()
-        
-        # Test with None data
-        assert not generator.create_excel(None, "output.xlsx")
-        assert "Null data received" in generator.errors
-        
-        # Test with wrong data type
-        assert not generator.create_excel("string data", "output.xlsx") 
-        assert any("Invalid data type" in error for error in generator.errors)
-        
-        # Test with empty data
-        assert not generator.create_excel({}, "output.xlsx")
-        assert "Empty data dictionary" in generator.errors
-        
-        # Test with None output path
-        assert not generator.create_excel({"data": "value"}, None)
-        assert "Null output path" in generator.errors
-        
-        # Test with wrong output path type
-        assert not generator.create_excel({"data": "value"}, 123)
-        assert any("Invalid output path type" in error for error in generator.errors)
-        
-        # Test with empty output path
-        assert not generator.create_excel({"data": "value"}, "")
-        assert "Empty output path" in generator.errors
-        
-        # Test with illegal characters
-        assert not generator.create_excel({"data": "value"}, "output*.xlsx")
-        assert any("Output path contains illegal characters" in error for error in generator.errors)
-        
-        # Test with incorrect extension
-        assert not generator.create_excel({"data": "value"}, "output.txt")
-        assert any("Output path must end with .xlsx or .xls" in error for error in generator.errors)
-        
-        # Test simulated error
-        assert not generator.create_excel({"data": "value"}, "error.xlsx")
-        assert "Simulated error in file creation" in generator.errors
-        
-        # Test successful case
-        assert generator.create_excel({"data": "value"}, "valid.xlsx")
+        result = generator.create_excel(data, output_path)
+        
+        if error is None:
+            assert result
+            assert not generator.errors
+        else:
+            assert not result
+            assert any(error in entry for entry in generator.errors)
 
 
 class TestComplexDataHandling:
@@ -331,67 +308,50 @@ class TestComplexDataHandling:
             # Data structure is valid
             return True
     
-    def test_complex_data_structures(self):
-        """Test with various complex data structures."""
-        generator = self.ComplexDataGenerator()
-        
-        # Test with minimally valid data
-        valid_data = {
+    @pytest.fixture
+    def generator(self):
+        """Fresh complex data generator for each case."""
+        return self.ComplexDataGenerator()
+    
+    @pytest.mark.parametrize("data, expected", [
+        pytest.param({
             'headers': ['Name', 'Age', 'Email'],
             'rows': [
                 ['John Doe', 30, 'john@example.com'],
                 ['Jane Smith', 25, 'jane@example.com']
             ]
-        }
-        assert generator.create_excel(valid_data, "output.xlsx")
-        
-        # Test with missing required fields
-        missing_headers = {
+        }, True, id="valid"),
+        pytest.param({
             'rows': [
                 ['John Doe', 30, 'john@example.com']
             ]
-        }
-        assert not generator.create_excel(missing_headers, "output.xlsx")
-        
-        missing_rows = {
+        }, False, id="missing_headers"),
+        pytest.param({
             'headers': ['Name', 'Age', 'Email']
-        }
-        assert not generator.create_excel(missing_rows, "output.xlsx")
-        
-        # Test with wrong data types
-        wrong_header_type = {
+        }, False, id="missing_rows"),
+        pytest.param({
             'headers': "Name,Age,Email",  # String instead of list
             'rows': [
                 ['John Doe', 30, 'john@example.com']
             ]
-        }
-        assert not generator.create_excel(wrong_header_type, "output.xlsx")
-        
-        wrong_rows_type = {
+        }, False, id="wrong_header_type"),
+        pytest.param({
             'headers': ['Name', 'Age', 'Email'],
             'rows': "John Doe,30,john@example.com\nJane Smith,25,jane@example.com"  # String instead of list
-        }
-        assert not generator.create_excel(wrong_rows_type, "output.xlsx")
-        
-        # Test with mismatched column counts
-        mismatched_columns = {
+        }, False, id="wrong_rows_type"),
+        pytest.param({
             'headers': ['Name', 'Age', 'Email'],
             'rows': [
                 ['John Doe', 30, 'john@example.com'],
                 ['Jane Smith', 25]  # Missing email
             ]
-        }
-        assert not generator.create_excel(mismatched_columns, "output.xlsx")
-        
-        # Test with empty arrays
-        empty_headers = {
+        }, False, id="mismatched_columns"),
+        pytest.param({
             'headers': [],
             'rows': []
-        }
-        assert not generator.create_excel(empty_headers, "output.xlsx")
-        
-        # Test with nested data
-        nested_data = {
+        }, False, id="empty_headers"),
+        # Only the structure is validated, not content types
+        pytest.param({
             'headers': ['Name', 'Contact', 'Address'],
             'rows': [
                 ['John Doe', {'email': 'john@example.com', 'phone': '555-1234'}, 
@@ -399,10 +359,14 @@ class TestComplexDataHandling:
                 ['Jane Smith', {'email': 'jane@example.com', 'phone': '555-5678'},
                  {'street': '456 Oak Ave', 'city': 'Somewhere', 'zip': '67890'}]
             ]
-        }
-        # This should work since we're just validating structure, not content types
-        assert generator.create_excel(nested_data, "output.xlsx")
-        assert generator.last_data == nested_data
+        }, True, id="nested_data"),
+    ])
+    def test_complex_data_structures(self, generator, data, expected):
+        """Test with various complex data structures."""
+        assert generator.create_excel(data, "output.xlsx") is expected
+        
+        # The call is recorded whether or not the data validates
+        assert generator.last_data == data
         assert generator.last_output_path == "output.xlsx"
 
 
@@ -566,6 +530,9 @@ class TestAdvancedIntegrationEdgeCases:
     class ComplexDataGenerator(GeneratorInterface):
         """Generator that handles more complex scenarios and configurations."""
         
+        # A1-style cell reference; \Z, unlike $, rejects a trailing newline
+        _CELL_RE = re.compile(r'\A[A-Z]+[0-9]+\Z')
+        
         def create_excel(self, data, output_path):
             """Create Excel with complex validation and handling."""
             # Basic validation
@@ -600,7 +567,7 @@ class TestAdvancedIntegrationEdgeCases:
                         return False
                         
                     # Validate cell references (basic check)
-                    if not re.match(r'^[A-Z]+[0-9]+$', cell):
+                    if not self._CELL_RE.match(cell):
                         return False
             
             # Handle styling
@@ -661,7 +628,15 @@ class TestAdvancedIntegrationEdgeCases:
             }
         }
         assert not generator.create_excel(invalid_formula_refs, 'output.xlsx')
-        
+
+        # Test with a cell reference followed by a newline
+        newline_formula_ref = {
+            'formulas': {
+                'C2\n': '=SUM(A2:B2)'
+            }
+        }
+        assert not generator.create_excel(newline_formula_ref, 'output.xlsx')
+
         # Test with permission issues (path starting with /restricted/)
         assert not generator.create_excel(valid_raw_data, '/restricted/output.xlsx')
         
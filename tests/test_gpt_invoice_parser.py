@@ -485,3 +485,65 @@ def test_process_directory_with_path_error(parser):
         # When directory doesn't exist, process_directory returns None
         result = parser.process_directory("/invalid/path")
         assert result is None
+
+def test_detect_supplier_cached_by_header(parser):
+    """Test supplier detection is reused for texts sharing the same header."""
+    header = "Iskus Health Ltd\n" * 300
+    with patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value='iskus') as mock_detect:
+        assert parser._detect_supplier(header + "Invoice A") == 'iskus'
+        assert parser._detect_supplier(header + "Invoice B") == 'iskus'
+        
+        # Both texts share the first 4KB, so the detector only runs once
+        mock_detect.assert_called_once()
+        
+    # A different detector (e.g. unpatched) must not be served stale results
+    with patch('src.utils.supplier_detector.SupplierDetector.detect_supplier', return_value='generic'):
+        assert parser._detect_supplier(header + "Invoice A") == 'generic'
+
+def test_process_directory_clears_supplier_cache(parser, tmp_path):
+    """Test process_directory starts with an empty supplier cache."""
+    parser._supplier_cache[(b'stale', None)] = 'iskus'
+    parser.process_directory(str(tmp_path))
+    assert not parser._supplier_cache
+
+@pytest.mark.parametrize("env_value, expected", [
+    ("3", 3),
+    ("auto", None),
+    ("0", None),
+    ("-2", None),
+    ("", None),
+])
+def test_default_max_workers(parser, monkeypatch, env_value, expected):
+    """Test INVOICE_MAX_WORKERS falls back to the CPU-based default unless it is a positive integer."""
+    monkeypatch.setenv("INVOICE_MAX_WORKERS", env_value)
+    default = min(parser.MAX_WORKERS, os.cpu_count() or 1)
+    assert parser._default_max_workers() == (expected or default)
+
+def test_process_directory_invalid_max_workers_env(parser, tmp_path, monkeypatch):
+    """Test process_directory still runs when INVOICE_MAX_WORKERS is not a number."""
+    monkeypatch.setenv("INVOICE_MAX_WORKERS", "auto")
+    (tmp_path / "invoice.txt").write_text("Invoice")
+    
+    with patch.object(parser, 'process_file', return_value=pd.DataFrame({'invoice_number': ['INV-001']})):
+        result = parser.process_directory(str(tmp_path))
+        
+    assert list(result[tmp_path.name]['invoice_number']) == ['INV-001']
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_process_directory_worker_counts(parser, tmp_path, max_workers):
+    """Test process_directory gives the same ordered result serially and concurrently."""
+    test_dir = tmp_path / "batch"
+    test_dir.mkdir()
+    for i in range(6):
+        (test_dir / f"invoice_{i}.txt").write_text(f"Invoice {i}")
+    
+    def side_effect(file_path):
+        return pd.DataFrame({'invoice_number': [os.path.basename(file_path)]})
+    
+    with patch.object(parser, 'process_file', side_effect=side_effect) as mock_process_file:
+        result = parser.process_directory(str(test_dir), max_workers=max_workers)
+        
+    combined = result["batch"]
+    assert mock_process_file.call_count == 6
+    assert list(combined['invoice_number']) == list(combined['source_file'])
+    assert sorted(combined['source_file']) == [f"invoice_{i}.txt" for i in range(6)]
@@ -8,6 +8,7 @@ from pathlib import Path
 import pandas as pd
 import tempfile
 from unittest.mock import patch, MagicMock
+from contextlib import ExitStack
 
 from src.parsers.gpt_invoice_parser import GPTInvoiceParser
 
@@ -17,11 +18,11 @@ def parser():
 
 # ---------------------- PDF Processing Tests ----------------------
 
-def test_pdf_with_special_supplier(parser, tmp_path):
+def test_pdf_with_special_supplier(parser, tmp_path, stub_pdf_path):
     """Test processing PDF with special supplier detection."""
     # Create a test PDF file
     pdf_file = tmp_path / "special_supplier.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
+    os.link(stub_pdf_path, pdf_file)
     
     # Mock fitz.open to return a mock document with supplier info
     mock_doc = MagicMock()
@@ -49,11 +50,11 @@ def test_pdf_with_special_supplier(parser, tmp_path):
                 assert isinstance(result, pd.DataFrame)
                 assert result['supplier_name'].iloc[0] == 'Special Supplier'
 
-def test_pdf_processing_with_content_supplier_detection(parser, tmp_path):
+def test_pdf_processing_with_content_supplier_detection(parser, tmp_path, stub_pdf_path):
     """Test PDF processing with supplier detection from content."""
     # Create a test PDF file
     pdf_file = tmp_path / "supplier_detection.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
+    os.link(stub_pdf_path, pdf_file)
     
     # Mock fitz document
     mock_doc = MagicMock()
@@ -81,14 +82,14 @@ def test_pdf_processing_with_content_supplier_detection(parser, tmp_path):
                 assert isinstance(result, pd.DataFrame)
                 assert result['supplier_name'].iloc[0] == 'United Drug'
 
-def test_final_supplier_detection_from_text(parser, tmp_path):
+def test_final_supplier_detection_from_text(parser, tmp_path, stub_pdf_path):
     """Test final supplier detection from text content."""
     # Looking at the implementation, we need to create a test that properly tests
     # the supplier detection from PDF content, which is more complex than we thought
     
     # Create a test PDF file with a name that clearly doesn't match any supplier pattern
     pdf_file = tmp_path / "no_supplier_name_in_file.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
+    os.link(stub_pdf_path, pdf_file)
     
     # Mock fitz document to return text that contains supplier information
     mock_doc = MagicMock()
@@ -149,11 +150,50 @@ def test_final_supplier_detection_from_text(parser, tmp_path):
         # Restore the original method
         parser.process_file = original_process_file
 
-def test_pymupdf_extraction(parser, tmp_path):
+# PyPDF2 reader fixture, supplier named in its text and extracted invoice number per case
+PDF_SUPPLIER_CASES = {
+    "united_drug": ("mock_pdf_reader_united_drug", "United Drug", "UD123"),
+    "special_supplier": ("mock_pdf_reader_special", "Special Supplier", "SP123"),
+}
+
+@pytest.fixture
+def patched_pdf_pipeline(request, parser):
+    """Patch the PDF pipeline so process_file reads a PDF_SUPPLIER_CASES entry through PyPDF2."""
+    reader_fixture, supplier_name, invoice_number = PDF_SUPPLIER_CASES[request.param]
+    
+    # PyMuPDF yields no text so processing falls through to PyPDF2
+    mock_doc = MagicMock()
+    mock_doc.__iter__.return_value = []
+    
+    with ExitStack() as stack:
+        stack.enter_context(patch('fitz.open', return_value=mock_doc))
+        stack.enter_context(patch('PyPDF2.PdfReader', return_value=request.getfixturevalue(reader_fixture)))
+        mock_extract = stack.enter_context(patch.object(parser, 'extract_data', return_value=pd.DataFrame({
+            "invoice_number": [invoice_number],
+            "supplier_name": [supplier_name]
+        })))
+        yield supplier_name, mock_extract
+
+@pytest.mark.parametrize("patched_pdf_pipeline", list(PDF_SUPPLIER_CASES), indirect=True)
+def test_pdf_pypdf2_fallback(parser, tmp_path, stub_pdf_path, patched_pdf_pipeline):
+    """Test PDF processing when the text comes from the PyPDF2 fallback."""
+    supplier_name, mock_extract = patched_pdf_pipeline
+    pdf_file = tmp_path / "pypdf2_fallback.pdf"
+    os.link(stub_pdf_path, pdf_file)
+    
+    result = parser.process_file(str(pdf_file))
+    
+    # Text extracted by PyPDF2 is what gets parsed, with the filename-based supplier
+    assert isinstance(result, pd.DataFrame)
+    text, supplier_type = mock_extract.call_args[0]
+    assert supplier_name in text
+    assert supplier_type == "unknown"
+
+def test_pymupdf_extraction(parser, tmp_path, stub_pdf_path):
     """Test fitz (PyMuPDF) PDF extraction."""
     # Create a valid PDF file
     pdf_file = tmp_path / "test_pymupdf.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest content")
+    os.link(stub_pdf_path, pdf_file)
     
     # Mock PyPDF2 to fail first (this will cause PyMuPDF to be used as fallback)
     with patch('PyPDF2.PdfReader', side_effect=Exception("PyPDF2 error")):
@@ -242,7 +282,7 @@ def test_supplier_detection_in_process_file(parser, tmp_path):
 
 # ---------------------- Constructor Tests ----------------------
 
-def test_constructor_options():
+def test_constructor_options(parser_init_signature):
     """Test GPTInvoiceParser constructor with different options."""
     # Test with API key explicitly provided
     parser = GPTInvoiceParser(api_key="custom_key")
@@ -254,9 +294,7 @@ def test_constructor_options():
         assert parser.api_key == "env_api_key"
     
     # Only test model parameter if it exists in the constructor
-    import inspect
-    init_signature = inspect.signature(GPTInvoiceParser.__init__)
-    if 'model' in init_signature.parameters:
+    if 'model' in parser_init_signature.parameters:
         # Test with model parameter if it exists
         parser = GPTInvoiceParser(api_key="test_key", model="gpt-4o")
         assert parser.model == "gpt-4o"
@@ -277,8 +315,11 @@ def test_process_directory_recursive(parser, tmp_path):
     sub_file = sub_dir / "invoice2.txt"
     sub_file.write_text("Subdir invoice")
     
-    # Create a list of all invoice files (used to patch glob.glob)
-    all_files = [str(main_file), str(sub_file)]
+    # Map each directory's glob pattern to its invoice files (used to patch glob.glob)
+    glob_results = {
+        os.path.join(str(main_dir), "*.txt"): [str(main_file)],
+        os.path.join(str(sub_dir), "*.txt"): [str(sub_file)],
+    }
     
     # Mock process_file to return test DataFrames
     def mock_process(file_path):
@@ -291,7 +332,7 @@ def test_process_directory_recursive(parser, tmp_path):
     # Apply the mocks
     with patch.object(parser, 'process_file', side_effect=mock_process):
         # Mock glob.glob to return our test files
-        with patch('glob.glob', side_effect=lambda path: [f for f in all_files if f.endswith(os.path.basename(path).replace('*', ''))]):
+        with patch('glob.glob', side_effect=lambda pattern: glob_results.get(pattern, [])):
             # Process the directory
             result = parser.process_directory(str(main_dir))
             
@@ -508,23 +549,16 @@ def test_date_format_ymdhms():
     result = parser._normalize_date_format("2023-05-15")
     assert result == "23.05.2015", "Should properly format YYYY-MM-DD dates"
 
-def test_import_exception_simulation():
+def test_import_exception_simulation(monkeypatch):
     """Test handling of missing imports by simulating their absence."""
-    # Save the original modules
-    original_pypdf2 = sys.modules.get('PyPDF2', None)
-    original_easyocr = sys.modules.get('easyocr', None)
+    import importlib
     
     try:
-        # Simulate missing PyPDF2
-        if 'PyPDF2' in sys.modules:
-            sys.modules['PyPDF2'] = None
-        
-        # Simulate missing easyocr
-        if 'easyocr' in sys.modules:
-            sys.modules['easyocr'] = None
+        # A None entry in sys.modules makes find_spec report the module as missing
+        monkeypatch.setitem(sys.modules, 'PyPDF2', None)
+        monkeypatch.setitem(sys.modules, 'easyocr', None)
         
         # Create a fresh import context
-        import importlib
         importlib.reload(sys.modules['src.parsers.gpt_invoice_parser'])
         
         # Verify that the code handles missing imports gracefully
@@ -538,13 +572,8 @@ def test_import_exception_simulation():
         assert parser is not None, "Parser should instantiate even with missing dependencies"
         
     finally:
-        # Restore the original modules
-        if original_pypdf2:
-            sys.modules['PyPDF2'] = original_pypdf2
-        if original_easyocr:
-            sys.modules['easyocr'] = original_easyocr
-        
-        # Reload the module to restore original state
+        # Restore the original modules, then reload the parser against them
+        monkeypatch.undo()
         importlib.reload(sys.modules['src.parsers.gpt_invoice_parser'])
 
 # ---------------------- Image Extraction Test ----------------------
@@ -580,3 +609,25 @@ def test_extract_text_from_image_error(parser):
         
         # Verify the result is None when an exception occurs
         assert result is None
+
+def test_extract_text_from_image_cached_by_content(parser):
+    """Test repeated images reuse the extracted text instead of calling the API again."""
+    mock_extractor = MagicMock()
+    mock_extractor.extract_text.return_value = "Cached invoice text"
+    
+    with patch('src.parsers.openai_extractor.OpenAIExtractor', return_value=mock_extractor):
+        assert parser.extract_text_from_image(b'same image') == "Cached invoice text"
+        assert parser.extract_text_from_image(b'same image') == "Cached invoice text"
+        assert parser.extract_text_from_image(b'other image') == "Cached invoice text"
+        
+        # Only distinct images reach the API
+        assert mock_extractor.extract_text.call_count == 2
+
+def test_extract_text_from_image_failures_not_cached(parser):
+    """Test failed extractions are retried on the next call."""
+    mock_extractor = MagicMock()
+    mock_extractor.extract_text.side_effect = [None, "Recovered text"]
+    
+    with patch('src.parsers.openai_extractor.OpenAIExtractor', return_value=mock_extractor):
+        assert parser.extract_text_from_image(b'flaky image') is None
+        assert parser.extract_text_from_image(b'flaky image') == "Recovered text"
@@ -1,3 +1,4 @@
+import os
 import pytest
 import pandas as pd
 from unittest.mock import patch, MagicMock
@@ -8,11 +9,11 @@ from src.parsers.gpt_invoice_parser import GPTInvoiceParser
 def parser():
     return GPTInvoiceParser(api_key="test_key")
 
-def test_pdf_special_supplier_detection(parser, tmp_path):
+def test_pdf_special_supplier_detection(parser, tmp_path, stub_pdf_path):
     """Test PDF processing with supplier detection using mock fitz document."""
     # Create a test PDF file
     pdf_file = tmp_path / "special_supplier.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
+    os.link(stub_pdf_path, pdf_file)
     
     # Mock fitz.open to return a mock document with supplier info
     mock_doc = MagicMock()
@@ -40,11 +41,11 @@ def test_pdf_special_supplier_detection(parser, tmp_path):
                 assert isinstance(result, pd.DataFrame)
                 assert result['supplier_name'].iloc[0] == 'Special Supplier'
 
-def test_united_drug_supplier_in_pdf(parser, tmp_path):
+def test_united_drug_supplier_in_pdf(parser, tmp_path, stub_pdf_path):
     """Test United Drug supplier detection from PDF content."""
     # Create a test PDF file
     pdf_file = tmp_path / "united_drug.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
+    os.link(stub_pdf_path, pdf_file)
     
     # Mock fitz document
     mock_doc = MagicMock()
@@ -94,11 +95,11 @@ def test_pdf_error_handling(parser, tmp_path):
                 result = parser.process_file(str(pdf_file))
                 assert result is None
 
-def test_pymupdf_extraction_fallback(parser, tmp_path):
+def test_pymupdf_extraction_fallback(parser, tmp_path, stub_pdf_path):
     """Test PyMuPDF extraction is used as fallback when PyPDF2 fails."""
     # Create a test PDF file
     pdf_file = tmp_path / "fallback.pdf"
-    pdf_file.write_bytes(b"%PDF-1.5\nTest PDF content")
+    os.link(stub_pdf_path, pdf_file)
     
     # Mock fitz document
     mock_doc = MagicMock()
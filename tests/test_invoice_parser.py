@@ -134,13 +134,13 @@ def test_extract_customer_info(parser):
         
         # Configure _extract_with_patterns to return different values based on patterns
         def patterns_side_effect(text, patterns):
-            if any("Customer" in p for p in patterns) or any("Bill" in p for p in patterns):
+            if any("Customer" in p.pattern for p in patterns) or any("Bill" in p.pattern for p in patterns):
                 return "Test Customer"
-            elif any("Address" in p for p in patterns) or any("INVOICE TO" in p for p in patterns):
+            elif any("Address" in p.pattern for p in patterns) or any("INVOICE TO" in p.pattern for p in patterns):
                 return "456 Customer St, Customertown"
-            elif any("Account" in p for p in patterns) or any("ID" in p for p in patterns):
+            elif any("Account" in p.pattern for p in patterns) or any("ID" in p.pattern for p in patterns):
                 return "12345"
-            elif any("Tel" in p for p in patterns):
+            elif any("Tel" in p.pattern for p in patterns):
                 return "555-9876"
             return ""
             
@@ -174,19 +174,19 @@ def test_extract_invoice_details(parser):
     with patch.object(parser, '_extract_with_patterns') as mock_patterns:
         
         def patterns_side_effect(text, patterns):
-            if any("Invoice.{0,3}Number" in p for p in patterns) or any("Invoice #" in p for p in patterns):
+            if any("Invoice.{0,3}Number" in p.pattern for p in patterns) or any("Invoice #" in p.pattern for p in patterns):
                 return "INV-123"
-            elif any("Date" in p for p in patterns):
+            elif any("Date" in p.pattern for p in patterns):
                 return "01-01-2025"
-            elif any("Time" in p for p in patterns):
+            elif any("Time" in p.pattern for p in patterns):
                 return "14:30"
-            elif any("Order" in p for p in patterns):
+            elif any("Order" in p.pattern for p in patterns):
                 return "ORD-456"
-            elif any("Reference" in p for p in patterns) or any("Ref" in p for p in patterns):
+            elif any("Reference" in p.pattern for p in patterns) or any("Ref" in p.pattern for p in patterns):
                 return "REF-789"
-            elif any("Delivery" in p for p in patterns):
+            elif any("Delivery" in p.pattern for p in patterns):
                 return "DEL-101"
-            elif any("Handled By" in p for p in patterns):
+            elif any("Handled By" in p.pattern for p in patterns):
                 return "John Smith"
             return ""
             
@@ -417,11 +417,11 @@ def test_extract_supplier_info(parser):
         
         # Configure _extract_with_patterns to return different values based on patterns
         def patterns_side_effect(text, patterns):
-            if any("Tel" in p for p in patterns):
+            if any("Tel" in p.pattern for p in patterns):
                 return "555-1234"
-            elif any("Fax" in p for p in patterns):
+            elif any("Fax" in p.pattern for p in patterns):
                 return "555-5678"
-            elif any("Email" in p for p in patterns):
+            elif any("Email" in p.pattern for p in patterns):
                 return "test@example.com"
             return ""
             
@@ -483,19 +483,19 @@ def test_extract_customer_info_detailed(parser):
         # Configure _extract_with_patterns to handle various pattern scenarios
         def patterns_side_effect(text, patterns):
             # Match customer name based on customer name patterns
-            if any("Customer.*Name" in p for p in patterns) or any("Bill To.*?:(.+?)(?:Account|Phone|$)" in p for p in patterns):
+            if any("Customer.*Name" in p.pattern for p in patterns) or any("Bill To.*?:(.+?)(?:Account|Phone|$)" in p.pattern for p in patterns):
                 return "Test Customer Company"
                 
             # Match address from bill to section
-            elif any("Bill To.*?:.*?(?:Account|ID|Name|Attn).*?:.*?(.+?)(?:Phone|Fax|Email|$)" in p for p in patterns):
+            elif any("Bill To.*?:.*?(?:Account|ID|Name|Attn).*?:.*?(.+?)(?:Phone|Fax|Email|$)" in p.pattern for p in patterns):
                 return "456 Customer Lane, Suite 789, CustomerCity, CT 54321"
                 
             # Match account number
-            elif any("Customer.*ID" in p for p in patterns) or any("Account.*Number" in p for p in patterns):
+            elif any("Customer.*ID" in p.pattern for p in patterns) or any("Account.*Number" in p.pattern for p in patterns):
                 return "CUST-12345"
                 
             # Match phone
-            elif any("Phone" in p for p in patterns) or any("Tel" in p for p in patterns):
+            elif any("Phone" in p.pattern for p in patterns) or any("Tel" in p.pattern for p in patterns):
                 return "555-9876"
                 
             return ""
@@ -139,21 +139,17 @@ def test_main_empty_results(test_env, mock_config, mock_parser, mock_generator):
 
 
 def test_main_no_text_extracted(test_env, mock_config, mock_parser):
-    """Test when no text is extracted (special test case)."""
+    """Test when no text is extracted an Info workbook is still written."""
     # Set up mock to return empty results
     mock_parser.process_directory.return_value = {}
     
-    # Patch sys._getframe to simulate test name
-    with patch('sys._getframe') as mock_frame:
-        mock_frame.return_value = type('MockFrame', (), {
-            'f_code': type('MockCode', (), {'co_name': 'test_main_no_text_extracted'})
-        })
-        
-        # Run main
-        result = main([str(test_env["dir"]), str(test_env["output"])])
-        
-        # Verify the result is 1 (failure in test mode)
-        assert result == 1
+    # Run main with the real Excel generator
+    result = main([str(test_env["dir"]), str(test_env["output"])])
+    
+    # Verify the result is 0 and the workbook holds only the Info sheet
+    assert result == 0
+    sheets = pd.read_excel(test_env["output"], sheet_name=None)
+    assert list(sheets) == ["Info"]
 
 
 def test_main_excel_generation_failure(test_env, mock_config, mock_parser, mock_generator):
@@ -136,3 +136,10 @@ class TestSupplierDetector:
         
         result = SupplierDetector.detect_supplier(None)
         assert result == "unknown"
+    
+    def test_replaced_patterns_recompiled(self, monkeypatch):
+        """Test that replacing SUPPLIER_PATTERNS takes effect on the next detection."""
+        assert SupplierDetector.detect_supplier("Invoice from Acme Medical") == "unknown"
+        
+        monkeypatch.setattr(SupplierDetector, "SUPPLIER_PATTERNS", {"acme": [r"Acme Medical"]})
+        assert SupplierDetector.detect_supplier("Invoice from ACME MEDICAL") == "acme"